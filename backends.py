@@ -0,0 +1,300 @@
+import csv
+import hashlib
+import io
+import os
+import threading
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+
+from db import db_url, make_arrow_pool, make_engine, pool_status
+from instrumentation import stage
+from prepared import NAMED_PARAM, PreparedQuery
+from pulse_schema import TABLES
+from rollups import ROLLUPS
+
+#==================Query backends for the dashboard==================
+#
+# The dashboard talks to a backend through run_query / execute_query /
+# dataset_version. Two are available, picked with PHONEPE_BACKEND:
+#
+#   postgres (default) - the database filled by data_insertion.py, through a
+#                        read-only pooled engine from db.py
+#   duckdb             - an embedded, in-process DuckDB reading the extracted
+#                        data in PHONEPE_DATA_DIR directly (Parquet datasets
+#                        from pulse_extract.py --format parquet, else the
+#                        CSVs); no database server needed
+#
+# SQL is written once with :name parameters and the rollup table names from
+# rollups.py; the DuckDB backend builds the same rollups in memory. Recurring
+# queries go through run_prepared with a PreparedQuery (see prepared.py).
+#
+# PHONEPE_FETCH picks how run_prepared brings results back:
+#
+#   rows (default) - rows fetched through the driver into Python objects,
+#                    then a DataFrame
+#   arrow          - an Arrow table (run_arrow) wrapped as a DataFrame of
+#                    ArrowDtype columns over the same buffers, with no
+#                    per-value Python objects. Postgres reads it through
+#                    ADBC (binary COPY) when adbc_driver_postgresql is
+#                    installed, else as COPY ... TO STDOUT CSV parsed by
+#                    pyarrow; DuckDB hands over its own Arrow result.
+#                    Needs pyarrow.
+#
+# benchmarks/bench_fetch.py compares the two.
+
+_DUCKDB_TYPES = {"TEXT": "VARCHAR", "INT": "INTEGER", "BIGINT": "BIGINT",
+                 "DOUBLE PRECISION": "DOUBLE"}
+
+FETCH_MODES = ("rows", "arrow")
+
+#Postgres type OID -> Arrow type of that column in the COPY CSV fallback;
+#anything else is read as text
+_ARROW_TYPES = {16: "bool", 20: "int64", 21: "int64", 23: "int64", 700: "double",
+                701: "double", 1700: "double", 25: "string", 1043: "string"}
+
+
+#ADBC hands NUMERIC columns (e.g. SUM of a BIGINT) over as text; read them
+#as doubles, like the COPY fallback does
+def _numeric_as_double(table):
+    import pyarrow as pa
+
+    for i, field in enumerate(table.schema):
+        if (field.metadata or {}).get(b"ADBC:postgresql:typname") == b"numeric":
+            storage = pa.chunked_array([chunk.storage if isinstance(chunk, pa.ExtensionArray) else chunk
+                                        for chunk in table.column(i).chunks], pa.string())
+            table = table.set_column(i, field.name, storage.cast(pa.float64()))
+    return table
+
+
+#DataFrame over an Arrow table's buffers (zero-copy, ArrowDtype columns)
+def arrow_frame(table):
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+class PostgresBackend:
+    name = "postgres"
+
+    def __init__(self, url: str = None, fetch: str = "rows"):
+        self.url = url
+        self.fetch = fetch
+        self.engine = make_engine(url, read_only=True, application_name="phonepe-dashboard")
+        self._arrow_pool = None
+        self._arrow_pool_lock = threading.Lock()
+
+    def run_query(self, sql: str, params=None):
+        with self.engine.connect() as conn, stage("sql"):
+            return pd.read_sql(text(sql), conn, params=params)
+
+    def execute_query(self, sql: str, params=None):
+        with self.engine.connect() as conn:
+            conn.execute(text(sql), params or {})
+
+    #PREPARE once per pooled connection, then EXECUTE with bound values. A
+    #statement whose plan went stale (e.g. the table was swapped for one with
+    #different column types) is deallocated and prepared again.
+    def run_prepared(self, query: PreparedQuery, values: dict = None):
+        bound = query.bind(values)
+        if self.fetch == "arrow":
+            return arrow_frame(self.run_arrow(query, bound))
+        with self.engine.connect() as conn:
+            prepared = conn.connection.info.setdefault("prepared_statements", set())
+            for attempt in (1, 2):
+                if query.statement not in prepared:
+                    conn.exec_driver_sql(query.prepare_sql())
+                    prepared.add(query.statement)
+                try:
+                    with stage("sql"):
+                        result = conn.execute(text(query.execute_sql()), bound)
+                    with stage("fetch"):
+                        return pd.DataFrame(result.fetchall(), columns=list(result.keys()))
+                except DBAPIError as e:
+                    if attempt == 2 or getattr(e.orig, "pgcode", None) != "0A000":
+                        raise
+                    conn.exec_driver_sql(f"DEALLOCATE {query.statement}")
+                    prepared.discard(query.statement)
+
+    #"adbc" or "copy": how run_arrow reads results
+    @property
+    def arrow_driver(self) -> str:
+        with self._arrow_pool_lock:
+            if self._arrow_pool is None:
+                self._arrow_pool = make_arrow_pool(self.url, read_only=True,
+                                                   application_name="phonepe-dashboard") or False
+        return "adbc" if self._arrow_pool else "copy"
+
+    #Result as a pyarrow Table
+    def run_arrow(self, query: PreparedQuery, values: dict = None):
+        bound = query.bind(values)
+        if self.arrow_driver == "copy":
+            return self._copy_arrow(query, bound)
+        conn = self._arrow_pool.connect()
+        try:
+            cursor = conn.cursor()
+            try:
+                with stage("sql"):
+                    cursor.execute(query.positional_sql(), query.positional_values(bound) or None)
+                with stage("fetch"):
+                    return _numeric_as_double(cursor.fetch_arrow_table())
+            finally:
+                cursor.close()
+        finally:
+            conn.close()
+
+    #Without ADBC: COPY the query out as CSV and parse it with pyarrow, typed
+    #from the result's column OIDs so e.g. pincodes stay text. Values are
+    #quoted into the SQL by psycopg2, COPY takes no bound parameters.
+    def _copy_arrow(self, query: PreparedQuery, bound: dict):
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        with self.engine.connect() as conn:
+            cursor = conn.connection.cursor()
+            try:
+                sql = cursor.mogrify(NAMED_PARAM.sub(r"%(\1)s", query.sql.replace("%", "%%")),
+                                     bound).decode()
+                cursor.execute(f"SELECT * FROM ({sql}) AS result LIMIT 0")
+                column_types = {column.name: pa.type_for_alias(_ARROW_TYPES.get(column.type_code, "string"))
+                                for column in cursor.description}
+                buffer = io.BytesIO()
+                with stage("sql"):
+                    cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv, HEADER)", buffer)
+                buffer.seek(0)
+                with stage("fetch"):
+                    return pa_csv.read_csv(buffer, convert_options=pa_csv.ConvertOptions(
+                        column_types=column_types, strings_can_be_null=True))
+            finally:
+                cursor.close()
+
+    #Version stamp written by data_insertion.py; None before the first stamped load
+    def dataset_version(self):
+        try:
+            with self.engine.connect() as conn:
+                return conn.execute(text("SELECT version FROM dataset_version WHERE id = 1")).scalar()
+        except ProgrammingError:
+            return None
+
+    def pool_status(self) -> dict:
+        return pool_status(self.engine)
+
+
+class DuckDBBackend:
+    name = "duckdb"
+    arrow_driver = "duckdb"
+
+    def __init__(self, data_dir: str = ".", fetch: str = "rows"):
+        import duckdb
+
+        self.data_dir = data_dir
+        self.fetch = fetch
+        self._conn = duckdb.connect(":memory:")
+        self._lock = threading.Lock()
+        self._signature = None
+        self._load()
+
+    def _parquet_dir(self, table: str) -> str:
+        return os.path.join(self.data_dir, table)
+
+    def _csv_path(self, table: str) -> str:
+        return os.path.join(self.data_dir, TABLES[table]["csv"])
+
+    #Source files and their mtimes; a change means the data was re-extracted
+    def _source_signature(self) -> str:
+        digest = hashlib.sha1()
+        for table in TABLES:
+            paths = [self._csv_path(table)]
+            for dirpath, _, filenames in os.walk(self._parquet_dir(table)):
+                paths.extend(os.path.join(dirpath, f) for f in filenames)
+            for path in sorted(paths):
+                if os.path.isfile(path):
+                    stat = os.stat(path)
+                    digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        return digest.hexdigest()
+
+    def _select_parquet(self, table: str) -> str:
+        pattern = os.path.join(self._parquet_dir(table), "**", "*.parquet").replace("'", "''")
+        columns = ", ".join(f"CAST({column} AS {_DUCKDB_TYPES[sql_type]}) AS {column}"
+                            for column, sql_type in TABLES[table]["columns"])
+        return f"SELECT {columns} FROM read_parquet('{pattern}', hive_partitioning = true)"
+
+    #CSVs may carry the notebook's headers or the final column names
+    def _select_csv(self, table: str) -> str:
+        spec = TABLES[table]
+        path = self._csv_path(table)
+        with open(path, newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f))
+        source = {spec["rename"].get(name, name): name for name in header}
+        columns = ", ".join(f'CAST("{source[column]}" AS {_DUCKDB_TYPES[sql_type]}) AS {column}'
+                            for column, sql_type in spec["columns"])
+        escaped = path.replace("'", "''")
+        return f"SELECT {columns} FROM read_csv('{escaped}', header = true, all_varchar = true)"
+
+    def _load(self):
+        signature = self._source_signature()
+        with self._lock:
+            for table in TABLES:
+                if os.path.isdir(self._parquet_dir(table)):
+                    select_sql = self._select_parquet(table)
+                else:
+                    select_sql = self._select_csv(table)
+                self._conn.execute(f"CREATE OR REPLACE TABLE {table} AS {select_sql}")
+            for name, (select_sql, _) in ROLLUPS.items():
+                self._conn.execute(f"CREATE OR REPLACE TABLE {name} AS {select_sql}")
+            self._signature = signature
+
+    def run_query(self, sql: str, params=None):
+        cursor = self._conn.cursor()
+        try:
+            with stage("sql"):
+                cursor.execute(NAMED_PARAM.sub(r"$\1", sql), params or {})
+            with stage("fetch"):
+                return cursor.df()
+        finally:
+            cursor.close()
+
+    def execute_query(self, sql: str, params=None):
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(NAMED_PARAM.sub(r"$\1", sql), params or {})
+        finally:
+            cursor.close()
+
+    #DuckDB prepares every parameterized statement itself
+    def run_prepared(self, query: PreparedQuery, values: dict = None):
+        if self.fetch == "arrow":
+            return arrow_frame(self.run_arrow(query, values))
+        return self.run_query(query.sql, query.bind(values))
+
+    def run_arrow(self, query: PreparedQuery, values: dict = None):
+        cursor = self._conn.cursor()
+        try:
+            with stage("sql"):
+                cursor.execute(NAMED_PARAM.sub(r"$\1", query.sql), query.bind(values))
+            with stage("fetch"):
+                return cursor.fetch_arrow_table()
+        finally:
+            cursor.close()
+
+    #Reload when the extracted files change; the signature doubles as the version
+    def dataset_version(self):
+        signature = self._source_signature()
+        if signature != self._signature:
+            self._load()
+        return self._signature
+
+    #In-process, no connection pool
+    def pool_status(self) -> dict:
+        return {}
+
+
+def get_backend():
+    backend = os.environ.get("PHONEPE_BACKEND", "postgres").lower()
+    fetch = os.environ.get("PHONEPE_FETCH", "rows").lower()
+    if fetch not in FETCH_MODES:
+        raise ValueError(f"Unknown PHONEPE_FETCH {fetch!r}, expected 'rows' or 'arrow'")
+    if backend == "duckdb":
+        return DuckDBBackend(os.environ.get("PHONEPE_DATA_DIR", "."), fetch)
+    if backend == "postgres":
+        return PostgresBackend(db_url(), fetch)
+    raise ValueError(f"Unknown PHONEPE_BACKEND {backend!r}, expected 'postgres' or 'duckdb'")
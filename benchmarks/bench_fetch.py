@@ -0,0 +1,78 @@
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from backends import DuckDBBackend, PostgresBackend
+from db import db_url
+from prepared import PreparedQuery
+from transaction_cube import CUBE_QUERY
+from use_cases import get_query
+
+#==================Result fetch benchmark==================
+#
+# Runs the widest dashboard queries, plus full scans of the largest raw
+# tables, through both PHONEPE_FETCH modes of a backend: "rows" (driver rows
+# into Python objects, then a DataFrame) and "arrow" (an Arrow table wrapped
+# as ArrowDtype columns, see backends.py). Reports the median time, the size
+# of the resulting DataFrame and the peak Python-side allocations of a run.
+#
+#   python -m benchmarks.bench_fetch --repeat 10
+#   python -m benchmarks.bench_fetch --backend duckdb --data-dir pulse_parquet
+
+#Whole results of the paged use-case queries (the dashboard fetches a page)
+QUERIES = {
+    "5.1 state x quarter": get_query("5.1").prepared,
+    "5.4 district x type": get_query("5.4").prepared,
+    "5.5 district x year": get_query("5.5").prepared,
+    "explore cube": CUBE_QUERY,
+    "scan map_transaction": PreparedQuery("bench_scan_map_transaction", "SELECT * FROM map_transaction"),
+    "scan map_insurance": PreparedQuery("bench_scan_map_insurance", "SELECT * FROM map_insurance"),
+}
+
+PARAMS = {"5.1 state x quarter": get_query("5.1").params,
+          "5.4 district x type": get_query("5.4").params,
+          "5.5 district x year": get_query("5.5").params}
+
+
+def time_fetch(backend, query: PreparedQuery, values: dict, repeat: int) -> tuple:
+    df = backend.run_prepared(query, values)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        backend.run_prepared(query, values)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    backend.run_prepared(query, values)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (statistics.median(timings) * 1000, len(df),
+            df.memory_usage(deep=True).sum() / 2**20, peak / 2**20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare row-based and Arrow result fetching")
+    parser.add_argument("--backend", choices=["postgres", "duckdb"], default="postgres")
+    parser.add_argument("--data-dir", default=".", help="extracted data for --backend duckdb")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.backend == "duckdb":
+        rows, arrow = DuckDBBackend(args.data_dir, "rows"), DuckDBBackend(args.data_dir, "arrow")
+    else:
+        rows, arrow = PostgresBackend(db_url(), "rows"), PostgresBackend(db_url(), "arrow")
+    print(f" arrow path: {arrow.arrow_driver}\n")
+
+    print(f"{'query':<22}{'rows':>9}{'rows ms':>10}{'arrow ms':>10}{'speedup':>9}"
+          f"{'frame MB':>10}{'arrow MB':>10}{'py peak MB':>12}{'arrow peak':>12}")
+    for label, query in QUERIES.items():
+        values = PARAMS.get(label)
+        before, n, before_mb, before_peak = time_fetch(rows, query, values, args.repeat)
+        after, _, after_mb, after_peak = time_fetch(arrow, query, values, args.repeat)
+        print(f"{label:<22}{n:>9}{before:>10.2f}{after:>10.2f}{before / after:>8.1f}x"
+              f"{before_mb:>10.2f}{after_mb:>10.2f}{before_peak:>12.2f}{after_peak:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+from benchmarks.pulse_synth import generate_tree
+from district_index import CENTROID_QUERY, DISTRICT_QUARTER_QUERY
+from pulse_extract import extract_to_parquet
+from pulse_schema import TABLES
+from transaction_cube import CUBE_QUERY
+
+#==================Scale benchmark==================
+#
+# For every scale factor: generate a synthetic Pulse tree (pulse_synth.py),
+# extract it to Parquet, load each table, then time every Business Use Case
+# query and the Explore page queries against the loaded data. Results are
+# written as one JSON document so runs can be compared over time.
+#
+#   python -m benchmarks.bench_scale --scale 1 10 100 --out bench_scale.json
+#   python -m benchmarks.bench_scale --scale 1 --backend duckdb
+#
+# --backend postgres loads with data_insertion.load_table into the database
+# of PHONEPE_DB_URL and REPLACES its tables: point it at a scratch database.
+# --backend duckdb needs no server; its load is the in-memory build of all
+# tables and rollups, so it is reported as one scenario.
+#
+# Scenario keys: "extract", "load/<table>", "load/rollups", "query/<id>" and
+# "query/<id>/count" for paged queries.
+# Query timings are the median, p95 and min of --repeat runs after one cold
+# run, in milliseconds.
+
+
+def time_runs(run, repeat: int) -> dict:
+    started = time.perf_counter()
+    df = run()
+    cold = time.perf_counter() - started
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {"rows": len(df), "cold_ms": cold * 1000,
+            "median_ms": statistics.median(timings) * 1000,
+            "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+            "min_ms": timings[0] * 1000}
+
+
+def load_postgres(parquet_dir: str) -> tuple:
+    from data_insertion import engine, ensure_manifest, load_table
+    from backends import PostgresBackend
+    from db import db_url
+    from rollups import refresh_rollups
+
+    scenarios = {}
+    ensure_manifest()
+    for table in TABLES:
+        timings = load_table(table, parquet_dir=parquet_dir)
+        scenarios[f"load/{table}"] = {key: value for key, value in timings.items() if key != "table"}
+    started = time.perf_counter()
+    refresh_rollups(engine)
+    scenarios["load/rollups"] = {"total_s": time.perf_counter() - started}
+    return scenarios, PostgresBackend(db_url())
+
+
+def load_duckdb(parquet_dir: str) -> tuple:
+    from backends import DuckDBBackend
+
+    started = time.perf_counter()
+    backend = DuckDBBackend(parquet_dir)
+    return {"load/duckdb": {"total_s": time.perf_counter() - started}}, backend
+
+
+#Every use-case query with its own parameters (paged ones as count plus first
+#page), plus the Explore page queries for the latest period and the first state
+def query_scenarios(backend, repeat: int) -> dict:
+    from use_cases import USE_CASES
+
+    scenarios = {}
+    for case in USE_CASES.values():
+        for q in case.queries:
+            prepared, values = q.prepared, q.params
+            if q.paging:
+                #What the dashboard runs: the row count, then the first page
+                scenarios[f"query/{q.query_id}/count"] = time_runs(
+                    lambda: backend.run_prepared(q.paging.count_query(prepared), values), repeat)
+                prepared, values = q.paging.page_query(prepared, values)
+            scenarios[f"query/{q.query_id}"] = time_runs(
+                lambda: backend.run_prepared(prepared, values), repeat)
+
+    scenarios["query/explore_cube"] = time_runs(lambda: backend.run_prepared(CUBE_QUERY), repeat)
+    scenarios["query/district_centroids"] = time_runs(lambda: backend.run_prepared(CENTROID_QUERY), repeat)
+    latest = backend.run_query("SELECT state, year, quarter FROM rollup_transaction_state_quarter "
+                               "ORDER BY year DESC, quarter DESC, state LIMIT 1")
+    if len(latest):
+        values = latest.iloc[0].to_dict()
+        scenarios["query/district_quarter"] = time_runs(
+            lambda: backend.run_prepared(DISTRICT_QUARTER_QUERY, values), repeat)
+    return scenarios
+
+
+def run_scale(scale: float, work_dir: str, backend_name: str, repeat: int, workers: int) -> dict:
+    out = os.path.join(work_dir, f"pulse_{scale:g}x")
+    tree = generate_tree(out, scale, workers=workers)
+    result = {"scale": scale, "files": tree["files"], "bytes": tree["bytes"],
+              "generate_s": tree["seconds"], "scenarios": {}}
+    print(f"\n scale {scale:g}x: {tree['files']} files, {tree['bytes'] / 2**20:,.1f} MB "
+          f"generated in {tree['seconds']:.2f}s")
+
+    parquet_dir = os.path.join(out, "parquet")
+    stats = extract_to_parquet(tree["root"], parquet_dir, workers=workers)
+    result["scenarios"]["extract"] = {"total_s": stats.seconds, "files": stats.files,
+                                      "files_per_s": stats.files_per_second,
+                                      "rows": dict(stats.rows)}
+
+    load = load_postgres if backend_name == "postgres" else load_duckdb
+    scenarios, backend = load(parquet_dir)
+    result["scenarios"].update(scenarios)
+    result["scenarios"].update(query_scenarios(backend, repeat))
+
+    for name, values in result["scenarios"].items():
+        if "median_ms" in values:
+            print(f" {name:<28}{values['median_ms']:>10.2f} ms median{values['rows']:>10} rows")
+        else:
+            print(f" {name:<28}{values['total_s']:>10.2f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time extraction, loading and the dashboard queries at several data scales")
+    parser.add_argument("--scale", type=float, nargs="+", default=[1.0],
+                        help="scale factors, 1 is about the real Pulse tree (default 1)")
+    parser.add_argument("--backend", choices=["postgres", "duckdb"], default="postgres",
+                        help="postgres replaces the tables in PHONEPE_DB_URL (default %(default)s)")
+    parser.add_argument("--work-dir", default="bench_data",
+                        help="where the generated trees and Parquet output go (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query (default %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="generator / extractor processes (default: one per core)")
+    parser.add_argument("--out", default="bench_scale.json", help="results file (default %(default)s)")
+    args = parser.parse_args()
+
+    report = {"benchmark": "scale",
+              "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+              "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                              "cpus": os.cpu_count(), "backend": args.backend},
+              "repeat": args.repeat,
+              "runs": [run_scale(scale, args.work_dir, args.backend, args.repeat, args.workers)
+                       for scale in args.scale]}
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
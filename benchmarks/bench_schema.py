@@ -0,0 +1,74 @@
+import argparse
+import re
+import statistics
+import time
+
+from sqlalchemy import text
+
+from data_insertion import engine, execute_query
+
+#==================Index / partitioning benchmark==================
+#
+# Times the dashboard-style filters against the loaded tables and against
+# plain heap copies of the same rows (no keys, no indexes), so the effect of
+# the physical schema in pulse_schema.py can be read side by side.
+#
+#   python -m benchmarks.bench_schema --repeat 20
+
+QUERIES = {
+    "period filter": ("agg_transaction",
+        "SELECT state, SUM(transaction_amount) FROM agg_transaction "
+        "WHERE year = :year AND quarter = :quarter GROUP BY state"),
+    "state-quarter lookup": ("map_users",
+        "SELECT districts, registered_users, app_opens FROM map_users "
+        "WHERE state = :state AND year = :year AND quarter = :quarter"),
+    "top pincodes": ("top_transaction",
+        "SELECT state, entity_name, amount FROM top_transaction "
+        "WHERE level = 'Pincode' ORDER BY amount DESC LIMIT 10"),
+    "top districts": ("top_users",
+        "SELECT state, district, registered_users FROM top_users "
+        "WHERE level = 'District' ORDER BY registered_users DESC LIMIT 10"),
+    "brand by year": ("agg_users",
+        "SELECT year, SUM(count) FROM agg_users WHERE brand = :brand GROUP BY year"),
+}
+
+
+def time_query(sql: str, params: dict, repeat: int) -> float:
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), params).fetchall()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare query latency on indexed tables vs plain heaps")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        year, quarter = conn.execute(text(
+            "SELECT year, quarter FROM agg_transaction ORDER BY year DESC, quarter DESC LIMIT 1")).one()
+        state = conn.execute(text("SELECT state FROM map_users LIMIT 1")).scalar()
+        brand = conn.execute(text("SELECT brand FROM agg_users LIMIT 1")).scalar()
+    params = {"year": year, "quarter": quarter, "state": state, "brand": brand}
+
+    print(f"{'query':<22}{'heap ms':>10}{'indexed ms':>12}{'speedup':>10}")
+    for label, (table, sql) in QUERIES.items():
+        heap = f"bench_heap_{table}"
+        execute_query(f"DROP TABLE IF EXISTS {heap}")
+        execute_query(f"CREATE TABLE {heap} AS SELECT * FROM {table}")
+        execute_query(f"ANALYZE {heap}")
+        try:
+            heap_sql = re.sub(rf"\b{table}\b", heap, sql)
+            before = time_query(heap_sql, params, args.repeat)
+            after = time_query(sql, params, args.repeat)
+        finally:
+            execute_query(f"DROP TABLE IF EXISTS {heap}")
+        print(f"{label:<22}{before:>10.2f}{after:>12.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
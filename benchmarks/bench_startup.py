@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+#==================Dashboard cold start benchmark==================
+#
+# Starts a fresh interpreter per sample and runs the dashboard script once
+# with Streamlit's AppTest, which executes it like a new server session:
+# module imports, backend creation, the first queries and the first render.
+# Reports the median time to import Streamlit itself, the time from there to
+# the first finished render of the chosen page, and which heavy libraries
+# the app itself pulled in on that page. Modules that Streamlit and AppTest
+# import on their own (plotly.graph_objects, for one) are not counted.
+#
+#   python -m benchmarks.bench_startup --repeat 5
+#   PHONEPE_BACKEND=duckdb PHONEPE_DATA_DIR=pulse_parquet python -m benchmarks.bench_startup --page use-cases
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                   "Indian_state_transaction_analysis.py")
+
+PAGES = {"explore": "🗺️ Explore Data", "use-cases": "📊 Business Use Cases"}
+
+HEAVY_MODULES = ["plotly.graph_objects", "matplotlib", "matplotlib.pyplot", "seaborn", "pyarrow",
+                 "sqlalchemy", "duckdb"]
+
+#Runs in the child interpreter; prints one JSON line
+_SAMPLE = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+preloaded = set(sys.modules)
+app = AppTest.from_file({app!r}, default_timeout=300)
+app.session_state["page"] = {page!r}
+app.run()
+rendered = time.perf_counter()
+print(json.dumps({{"streamlit_import_s": imported - started, "first_render_s": rendered - imported,
+                  "errors": [str(e.value) for e in app.exception],
+                  "loaded": [m for m in {heavy!r} if m in sys.modules and m not in preloaded]}}))
+"""
+
+
+def sample(page: str) -> dict:
+    code = _SAMPLE.format(app=APP, page=PAGES[page], heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(APP), check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time a cold dashboard start to its first render")
+    parser.add_argument("--page", choices=list(PAGES), nargs="+", default=list(PAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="fresh processes per page (default %(default)s)")
+    args = parser.parse_args()
+
+    print(f"{'page':<12}{'streamlit s':>13}{'first render s':>16}  heavy modules the app loaded")
+    for page in args.page:
+        samples = [sample(page) for _ in range(args.repeat)]
+        errors = [error for s in samples for error in s["errors"]]
+        if errors:
+            print(f"{page:<12} failed: {errors[0]}")
+            continue
+        print(f"{page:<12}{statistics.median(s['streamlit_import_s'] for s in samples):>13.2f}"
+              f"{statistics.median(s['first_render_s'] for s in samples):>16.2f}  "
+              f"{', '.join(samples[-1]['loaded'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import random
+import shutil
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from pulse_extract import DATASETS
+
+#==================Synthetic Pulse-shaped data==================
+#
+# Writes a data/ tree in the layout and JSON shape of the PhonePe Pulse
+# repository (aggregated / map / top for transaction, user and insurance),
+# so pulse_extract.py, data_insertion.py and the dashboard queries can be
+# timed on more data than the real tree holds.
+#
+#   python -m benchmarks.pulse_synth --scale 10 --out bench_data/pulse_10x
+#
+# Scale 1 is roughly the size of the real tree: 36 states, 24 quarters, about
+# 20 districts per state. The scale factor multiplies what grows in practice,
+# the district-level and pincode-level entries (map and top files, insurance
+# points); the states, quarters, transaction types and brands stay fixed. Every
+# file is seeded from its path, so the same scale always gives the same tree.
+
+STATES = [
+    "andaman-&-nicobar-islands", "andhra-pradesh", "arunachal-pradesh", "assam", "bihar",
+    "chandigarh", "chhattisgarh", "dadra-&-nagar-haveli-&-daman-&-diu", "delhi", "goa",
+    "gujarat", "haryana", "himachal-pradesh", "jammu-&-kashmir", "jharkhand", "karnataka",
+    "kerala", "ladakh", "lakshadweep", "madhya-pradesh", "maharashtra", "manipur",
+    "meghalaya", "mizoram", "nagaland", "odisha", "puducherry", "punjab", "rajasthan",
+    "sikkim", "tamil-nadu", "telangana", "tripura", "uttar-pradesh", "uttarakhand",
+    "west-bengal",
+]
+YEARS = list(range(2018, 2024))
+
+TRANSACTION_TYPES = ["Recharge & bill payments", "Peer-to-peer payments", "Merchant payments",
+                     "Financial Services", "Others"]
+BRANDS = ["Xiaomi", "Samsung", "Vivo", "Oppo", "OnePlus", "Realme", "Apple", "Motorola",
+          "Lenovo", "Huawei", "Others"]
+
+#Entries per state-quarter file at scale 1
+DISTRICTS = 20
+TOP_ENTRIES = 10
+POINTS_PER_DISTRICT = 5
+
+
+def scaled(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def district_names(state: str, scale: float) -> list:
+    return [f"{state} d{i:05d}" for i in range(scaled(DISTRICTS, scale))]
+
+
+def _metric(rnd, count_max: int, mean_value: float) -> dict:
+    count = rnd.randint(1, count_max)
+    return {"type": "TOTAL", "count": count, "amount": round(count * mean_value * rnd.uniform(0.5, 1.5), 2)}
+
+
+#The "data" object of one state-quarter file of a dataset
+def _agg_transaction(rnd, state, scale):
+    return {"transactionData": [{"name": name, "paymentInstruments": [_metric(rnd, 10**7, 1500.0)]}
+                                for name in TRANSACTION_TYPES]}
+
+
+def _agg_insurance(rnd, state, scale):
+    return {"transactionData": [{"name": "Insurance", "paymentInstruments": [_metric(rnd, 10**4, 900.0)]}]}
+
+
+def _agg_users(rnd, state, scale):
+    counts = [rnd.randint(1000, 10**6) for _ in BRANDS]
+    total = sum(counts)
+    return {"aggregated": {"registeredUsers": total, "appOpens": total * rnd.randint(5, 50)},
+            "usersByDevice": [{"brand": brand, "count": count, "percentage": count / total}
+                              for brand, count in zip(BRANDS, counts)]}
+
+
+def _top_metric(rnd, state, scale, count_max=10**6):
+    districts = district_names(state, scale)
+    n = scaled(TOP_ENTRIES, scale)
+    return {"states": None,
+            "districts": [{"entityName": name, "metric": _metric(rnd, count_max, 1200.0)}
+                          for name in rnd.sample(districts, min(n, len(districts)))],
+            "pincodes": [{"entityName": str(100000 + rnd.randrange(800000)),
+                          "metric": _metric(rnd, count_max, 1200.0)} for _ in range(n)]}
+
+
+def _top_insurance(rnd, state, scale):
+    return _top_metric(rnd, state, scale, count_max=10**3)
+
+
+def _top_users(rnd, state, scale):
+    districts = district_names(state, scale)
+    n = scaled(TOP_ENTRIES, scale)
+    return {"states": None,
+            "districts": [{"name": name, "registeredUsers": rnd.randint(1000, 10**6)}
+                          for name in rnd.sample(districts, min(n, len(districts)))],
+            "pincodes": [{"name": str(100000 + rnd.randrange(800000)),
+                          "registeredUsers": rnd.randint(100, 10**5)} for _ in range(n)]}
+
+
+def _map_transaction(rnd, state, scale):
+    return {"hoverDataList": [{"name": f"{name} district", "metric": [_metric(rnd, 10**6, 1500.0)]}
+                              for name in district_names(state, scale)]}
+
+
+def _map_insurance(rnd, state, scale):
+    #Points scatter around a per-district centre, labelled like the real file
+    points = []
+    for name in district_names(state, scale):
+        lat, lng = rnd.uniform(8.0, 34.0), rnd.uniform(69.0, 96.0)
+        for _ in range(POINTS_PER_DISTRICT):
+            points.append([round(lat + rnd.gauss(0, 0.1), 6), round(lng + rnd.gauss(0, 0.1), 6),
+                           float(rnd.randint(1, 50)), name.title()])
+    return {"data": {"columns": ["lat", "lng", "metric", "label"], "data": points}}
+
+
+def _map_users(rnd, state, scale):
+    return {"hoverData": {f"{name} district": {"registeredUsers": rnd.randint(1000, 10**6),
+                                               "appOpens": rnd.randint(0, 10**7)}
+                          for name in district_names(state, scale)}}
+
+
+GENERATORS = {
+    "agg_transaction": _agg_transaction,
+    "agg_insurance": _agg_insurance,
+    "agg_users": _agg_users,
+    "top_transaction": _top_metric,
+    "top_insurance": _top_insurance,
+    "top_users": _top_users,
+    "map_transaction": _map_transaction,
+    "map_insurance": _map_insurance,
+    "map_users": _map_users,
+}
+
+
+#Worker: write the nine dataset files of one state and year
+def _write_state_year(args) -> tuple:
+    data_dir, state, year, scale, seed = args
+    files = size = 0
+    for table, generate in GENERATORS.items():
+        directory = os.path.join(data_dir, *DATASETS[table][0].split("/"), state, str(year))
+        os.makedirs(directory, exist_ok=True)
+        for quarter in range(1, 5):
+            rnd = random.Random(zlib.crc32(f"{seed}/{table}/{state}/{year}/{quarter}".encode()))
+            path = os.path.join(directory, f"{quarter}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"success": True, "code": "SUCCESS", "data": generate(rnd, state, scale)},
+                          f, separators=(",", ":"))
+            files += 1
+            size += os.path.getsize(path)
+    return files, size
+
+
+#Write <out>/data/... for a scale factor, replacing an older tree there.
+#Returns the file count, total bytes and seconds taken.
+def generate_tree(out: str, scale: float = 1.0, states: list = None, years: list = None,
+                  workers: int = None, seed: int = 0) -> dict:
+    data_dir = os.path.join(out, "data")
+    shutil.rmtree(data_dir, ignore_errors=True)
+    started = time.perf_counter()
+    tasks = [(data_dir, state, year, scale, seed) for state in states or STATES for year in years or YEARS]
+    if workers == 1:
+        results = [_write_state_year(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_write_state_year, tasks))
+    return {"root": data_dir, "files": sum(f for f, _ in results), "bytes": sum(s for _, s in results),
+            "seconds": time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Pulse-format JSON tree")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiplier for district / pincode entries, 1 is about the real tree (default %(default)s)")
+    parser.add_argument("--out", default="bench_data", help="directory for the data/ tree (default %(default)s)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="writer processes (default: one per core, 1 writes inline)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tree = generate_tree(args.out, args.scale, workers=args.workers, seed=args.seed)
+    print(f" {tree['files']} files, {tree['bytes'] / 2**20:,.1f} MB in {tree['seconds']:.2f}s -> {tree['root']}")
+
+
+if __name__ == "__main__":
+    main()
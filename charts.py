@@ -0,0 +1,115 @@
+import io
+import struct
+from dataclasses import dataclass
+
+import streamlit as st
+
+#==================Chart specs for the Business Use Cases page==================
+#
+# Every use-case chart is one of three shapes in the dashboard's dark theme,
+# so a query declares a ChartSpec (kind, columns, axis labels) instead of its
+# own matplotlib code. The figure is drawn once per (query, dataset version)
+# and the PNG bytes are cached for every session; a rerun or another viewer
+# only re-sends the image instead of rasterizing it again.
+#
+# The PNG is never wider than Streamlit's content column (MAX_WIDTH px):
+# st.image(width="stretch") resizes and re-encodes a wider image on every
+# view, which would undo the cache.
+
+BACKGROUND = "#2D1B4E"
+BAR_COLOR = "#00D9FF"
+TEXT_COLOR = "white"
+FIGSIZE = (10, 6)
+DPI = 140
+MAX_WIDTH = 1460
+PAD_INCHES = 0.1
+CHART_CACHE_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    kind: str           #"bar", "barh" or "line"
+    labels: str         #category / x column; "year_quarter" is derived from year and quarter
+    values: str         #value column
+    xlabel: str
+    ylabel: str
+    rotation: int = 0   #x tick label rotation
+
+
+def bar(labels: str, values: str, xlabel: str, ylabel: str, rotation: int = 45) -> ChartSpec:
+    return ChartSpec("bar", labels, values, xlabel, ylabel, rotation)
+
+
+def barh(labels: str, values: str, xlabel: str, ylabel: str) -> ChartSpec:
+    return ChartSpec("barh", labels, values, xlabel, ylabel)
+
+
+def line(labels: str, values: str, xlabel: str, ylabel: str, rotation: int = 0) -> ChartSpec:
+    return ChartSpec("line", labels, values, xlabel, ylabel, rotation)
+
+
+def _labels(df, column: str):
+    if column == "year_quarter" and column not in df:
+        return df['year'].astype(str) + '-Q' + df['quarter'].astype(str)
+    return df[column]
+
+
+#Draw a spec to PNG bytes. A standalone Figure (no pyplot state) keeps this
+#safe to call from any thread.
+def render_png(spec: ChartSpec, df) -> bytes:
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=FIGSIZE, facecolor=BACKGROUND)
+    ax = fig.subplots()
+    ax.set_facecolor(BACKGROUND)
+    labels = _labels(df, spec.labels)
+    positions = range(len(df))
+
+    if spec.kind == "barh":
+        ax.barh(positions, df[spec.values], color=BAR_COLOR)
+        ax.set_yticks(positions, labels)
+        ax.invert_yaxis()
+    elif spec.kind == "bar":
+        ax.bar(positions, df[spec.values], color=BAR_COLOR)
+        ax.set_xticks(positions, labels)
+    else:
+        ax.plot(labels, df[spec.values], color=BAR_COLOR, marker='o', linewidth=2)
+
+    ax.set_xlabel(spec.xlabel, color=TEXT_COLOR)
+    ax.set_ylabel(spec.ylabel, color=TEXT_COLOR)
+    ax.tick_params(colors=TEXT_COLOR)
+    if spec.rotation:
+        for tick in ax.get_xticklabels():
+            tick.set_rotation(spec.rotation)
+            tick.set_horizontalalignment('right')
+    for spine in ax.spines.values():
+        spine.set_color(TEXT_COLOR)
+
+    #Long labels widen the tight box past FIGSIZE; lower the resolution to fit.
+    #Text extents do not scale exactly with DPI, so check the written width.
+    dpi = min(DPI, MAX_WIDTH / (fig.get_tightbbox().width + 2 * PAD_INCHES))
+    while True:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight", pad_inches=PAD_INCHES,
+                    facecolor=BACKGROUND)
+        png = buffer.getvalue()
+        width = png_width(png)
+        if width <= MAX_WIDTH:
+            return png
+        dpi *= 0.98 * MAX_WIDTH / width
+
+
+#Pixel width from the PNG header (IHDR)
+def png_width(png: bytes) -> int:
+    return struct.unpack(">I", png[16:20])[0]
+
+
+#PNG for a query's chart, drawn once per dataset version. The frame is not
+#hashed: for a given query and version the result is always the same.
+@st.cache_data(max_entries=CHART_CACHE_ENTRIES, show_spinner=False)
+def cached_png(query_id: str, version, spec_key: str, _spec: ChartSpec, _df) -> bytes:
+    return render_png(_spec, _df)
+
+
+def show_chart(query_id: str, version, spec: ChartSpec, df):
+    st.image(cached_png(query_id, version, repr(spec), spec, df), width="stretch")
@@ -0,0 +1,93 @@
+import re
+from dataclasses import dataclass
+
+import pandas as pd
+
+from prepared import PreparedQuery
+
+#==================District lookup index for the drill-down map==================
+#
+# The Pulse tables spell districts differently: map_transaction and map_users
+# say "north goa district", map_insurance labels its lat/long points
+# "North Goa". normalize_district() reduces both to one key, and the index maps
+# (state, key) to the district's centroid, the mean of its map_insurance
+# points (prebuilt by the rollup_insurance_district_point rollup).
+#
+# The index is built once per dataset version and held in memory, so a state
+# drill-down is one indexed query on rollup_transaction_district_quarter plus
+# dictionary lookups for the coordinates.
+
+_NOT_ALNUM = re.compile(r"[^a-z0-9]+")
+_DISTRICT_WORD = re.compile(r"\bdistrict\b")
+
+CENTROID_QUERY = PreparedQuery("district_centroids", """
+SELECT state, districts, point_count, latitude, longitude
+FROM rollup_insurance_district_point
+""")
+
+DISTRICT_QUARTER_QUERY = PreparedQuery("district_quarter", """
+SELECT districts, total_count, total_amount
+FROM rollup_transaction_district_quarter
+WHERE state = :state AND year = :year AND quarter = :quarter
+ORDER BY total_amount DESC
+""", (("state", str), ("year", int), ("quarter", int)))
+
+
+def normalize_district(name: str) -> str:
+    name = _DISTRICT_WORD.sub(" ", str(name).lower().replace("&", " and "))
+    return _NOT_ALNUM.sub("", name)
+
+
+@dataclass
+class DistrictPoint:
+    name: str
+    latitude: float
+    longitude: float
+    points: int
+
+
+class DistrictIndex:
+
+    def __init__(self, districts: dict):
+        self.districts = districts      #(state, key) -> DistrictPoint
+        self._states = {}
+        for (state, _), point in districts.items():
+            self._states.setdefault(state, []).append(point)
+
+    #Merge spellings that normalize to one key, weighting by point count
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DistrictIndex":
+        districts = {}
+        for row in df.itertuples(index=False):
+            key = (row.state, normalize_district(row.districts))
+            points = int(row.point_count)
+            current = districts.get(key)
+            if current is None:
+                districts[key] = DistrictPoint(str(row.districts).title(), float(row.latitude),
+                                               float(row.longitude), points)
+            else:
+                total = current.points + points
+                current.latitude = (current.latitude * current.points + row.latitude * points) / total
+                current.longitude = (current.longitude * current.points + row.longitude * points) / total
+                current.points = total
+        return cls(districts)
+
+    def lookup(self, state: str, district: str):
+        return self.districts.get((state, normalize_district(district)))
+
+    #Mean of the state's district centroids, to centre the drill-down map
+    def state_center(self, state: str):
+        points = self._states.get(state)
+        if not points:
+            return None
+        return (sum(p.latitude for p in points) / len(points),
+                sum(p.longitude for p in points) / len(points))
+
+    #Add district_name, latitude and longitude to one state's district rows;
+    #districts without a known location are dropped
+    def locate(self, state: str, df: pd.DataFrame, column: str = "districts") -> pd.DataFrame:
+        found = [self.lookup(state, name) for name in df[column]]
+        located = df.assign(district_name=[p.name if p else None for p in found],
+                            latitude=[p.latitude if p else None for p in found],
+                            longitude=[p.longitude if p else None for p in found])
+        return located.dropna(subset=["latitude", "longitude"]).reset_index(drop=True)
@@ -0,0 +1,244 @@
+import argparse
+import json
+import logging
+import math
+import os
+import urllib.request
+
+#==================Local India state boundaries for the choropleth==================
+#
+# The Explore map used to hand the browser a remote gist URL, so every render
+# downloaded the full-resolution boundaries and the map broke without network.
+# The file is now fetched once into assets/ and simplified into one GeoJSON per
+# detail level; the dashboard reads those from disk once per process.
+#
+# Building the levels is a deploy step, run before the dashboard starts; the
+# dashboard never fetches or simplifies while serving a request:
+#
+#   python geo_assets.py                     # fetch (if missing) and build all levels
+#   python geo_assets.py --source states.geojson
+#
+# Simplification keeps the topology: every ring is cut into arcs at the points
+# where the set of states sharing a boundary changes, each arc is simplified
+# once with Douglas-Peucker, and both neighbours reuse that same arc, so
+# simplified borders never open gaps or overlaps between states.
+
+GEOJSON_URL = ("https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/"
+               "e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson")
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+SOURCE_FILE = "india_states.geojson"
+NAME_PROPERTY = "ST_NM"
+
+#level -> (Douglas-Peucker tolerance in degrees, decimals kept), finest first
+LEVELS = {
+    "high": (0.002, 4),
+    "medium": (0.01, 3),
+    "low": (0.03, 3),
+}
+
+#Lowest map zoom each level is meant for
+LEVEL_MIN_ZOOM = {"high": 6, "medium": 4.5, "low": 0}
+
+#Shared vertices of neighbouring states are matched after rounding to this
+SNAP_DECIMALS = 6
+
+logger = logging.getLogger("phonepe.geo")
+
+
+def level_path(level: str, assets_dir: str = ASSETS_DIR) -> str:
+    return os.path.join(assets_dir, f"india_states_{level}.geojson")
+
+
+def level_for_zoom(zoom: float) -> str:
+    for level, min_zoom in LEVEL_MIN_ZOOM.items():
+        if zoom >= min_zoom:
+            return level
+    return "low"
+
+
+#Download the full-resolution file into assets/ unless it is already there
+def fetch_source(assets_dir: str = ASSETS_DIR, url: str = GEOJSON_URL, timeout: float = 30) -> str:
+    path = os.path.join(assets_dir, SOURCE_FILE)
+    if not os.path.exists(path):
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            data = response.read()
+        os.makedirs(assets_dir, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+    return path
+
+
+def _polygons(geometry) -> list:
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+    return []
+
+
+def _snap(point) -> tuple:
+    return (round(point[0], SNAP_DECIMALS), round(point[1], SNAP_DECIMALS))
+
+
+def _segment_distance(p, a, b) -> float:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    t = max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+
+#Iterative Douglas-Peucker; the end points are always kept
+def douglas_peucker(points: list, tolerance: float) -> list:
+    if len(points) < 3:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        worst, worst_i = 0.0, None
+        for i in range(first + 1, last):
+            d = _segment_distance(points[i], points[first], points[last])
+            if d > worst:
+                worst, worst_i = d, i
+        if worst_i is not None and worst > tolerance:
+            keep[worst_i] = True
+            stack.append((first, worst_i))
+            stack.append((worst_i, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _ring_area(ring) -> float:
+    return abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:]))) / 2
+
+
+class _Topology:
+
+    def __init__(self, features):
+        #point -> states whose rings pass through it
+        self.owners = {}
+        for i, feature in enumerate(features):
+            for polygon in _polygons(feature.get("geometry") or {}):
+                for ring in polygon:
+                    for point in ring:
+                        self.owners.setdefault(_snap(point), set()).add(i)
+        self._arcs = {}
+
+    #Vertices where the neighbour set changes; arcs run between them
+    def _junctions(self, ring) -> list:
+        n = len(ring) - 1
+        owners = [frozenset(self.owners[p]) for p in ring[:n]]
+        junctions = [i for i in range(n)
+                     if owners[i] != owners[i - 1] or owners[i] != owners[(i + 1) % n]
+                     or len(owners[i]) > 2]
+        #No junction (an island, or an enclave inside one neighbour): start both
+        #copies of the ring at the same point so they simplify identically
+        return junctions or [min(range(n), key=lambda i: ring[i])]
+
+    #One simplification per arc, shared by both states that border it
+    def _simplify_arc(self, arc: list, tolerance: float) -> list:
+        key = tuple(arc)
+        reverse = tuple(reversed(arc))
+        canonical = min(key, reverse)
+        if canonical not in self._arcs:
+            self._arcs[canonical] = douglas_peucker(list(canonical), tolerance)
+        simplified = self._arcs[canonical]
+        return simplified if canonical == key else simplified[::-1]
+
+    def simplify_ring(self, ring, tolerance: float) -> list:
+        ring = [_snap(p) for p in ring]
+        if ring[0] != ring[-1]:
+            ring.append(ring[0])
+        n = len(ring) - 1
+        junctions = self._junctions(ring)
+        out = []
+        for j, start in enumerate(junctions):
+            end = junctions[(j + 1) % len(junctions)]
+            if end <= start:
+                end += n
+            arc = [ring[i % n] for i in range(start, end + 1)]
+            out.extend(self._simplify_arc(arc, tolerance)[:-1])
+        out.append(out[0])
+        return out
+
+
+def _round_ring(ring, decimals: int) -> list:
+    out = []
+    for x, y in ring:
+        point = [round(x, decimals), round(y, decimals)]
+        if not out or point != out[-1]:
+            out.append(point)
+    return out
+
+
+#Simplified copy of a FeatureCollection keeping only the state name property.
+#Rings that collapse are dropped, except each state's largest polygon.
+def simplify_collection(collection: dict, tolerance: float, decimals: int) -> dict:
+    features = collection["features"]
+    topology = _Topology(features)
+    simplified = []
+    for feature in features:
+        polygons = []
+        for polygon in _polygons(feature.get("geometry") or {}):
+            shell, *holes = [_round_ring(topology.simplify_ring(ring, tolerance), decimals)
+                             for ring in polygon]
+            if len(shell) >= 4:
+                polygons.append([shell] + [ring for ring in holes if len(ring) >= 4])
+        if not polygons:
+            #Too small to survive the tolerance (tiny islands): keep the source outline
+            largest = max(_polygons(feature["geometry"]), key=lambda p: _ring_area(p[0]))
+            polygons = [[_round_ring(ring, decimals) for ring in largest]]
+        geometry = ({"type": "Polygon", "coordinates": polygons[0]} if len(polygons) == 1
+                    else {"type": "MultiPolygon", "coordinates": polygons})
+        simplified.append({"type": "Feature",
+                           "properties": {NAME_PROPERTY: feature["properties"][NAME_PROPERTY]},
+                           "geometry": geometry})
+    return {"type": "FeatureCollection", "features": simplified}
+
+
+#Write assets/india_states_<level>.geojson for every level from the source file
+def build_levels(source: str, assets_dir: str = ASSETS_DIR) -> dict:
+    with open(source, encoding="utf-8") as f:
+        collection = json.load(f)
+    os.makedirs(assets_dir, exist_ok=True)
+    sizes = {}
+    for level, (tolerance, decimals) in LEVELS.items():
+        path = level_path(level, assets_dir)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(simplify_collection(collection, tolerance, decimals), f,
+                      separators=(",", ":"), ensure_ascii=False)
+        sizes[level] = os.path.getsize(path)
+    return sizes
+
+
+#The built boundaries for a map zoom, read from disk. None when the levels
+#have not been built (python geo_assets.py), so the caller can fall back to
+#GEOJSON_URL; that is logged as a warning rather than built here.
+def load_states_geojson(zoom: float, assets_dir: str = ASSETS_DIR):
+    path = level_path(level_for_zoom(zoom), assets_dir)
+    if not os.path.exists(path):
+        logger.warning("%s is missing, the map falls back to the remote boundaries; "
+                       "run python geo_assets.py before starting the dashboard", path)
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache and simplify the India state boundaries for the dashboard map")
+    parser.add_argument("--source", help="local full-resolution GeoJSON (default: fetch once into assets/)")
+    parser.add_argument("--assets-dir", default=ASSETS_DIR)
+    args = parser.parse_args()
+
+    source = args.source or fetch_source(args.assets_dir)
+    full = os.path.getsize(source)
+    print(f" source {full / 1024:,.0f} KB")
+    for level, size in build_levels(source, args.assets_dir).items():
+        print(f" {level:<8}{size / 1024:>8,.0f} KB  ({size / full:.0%})")
+
+
+if __name__ == "__main__":
+    main()
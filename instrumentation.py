@@ -0,0 +1,117 @@
+import io
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+
+#==================Dashboard timing instrumentation==================
+#
+# Every dashboard query and render runs inside a span named after what it
+# serves ("Query 3.4", "Explore cube", ...). Inside a span, stage() times the
+# pieces: "sql" (execution in the database) and "fetch" (rows into a
+# DataFrame) in the backends, "style" and "chart" in the renderers. When the
+# span closes a "total" event (or the span's own name, e.g. "render") is added
+# with the rows and bytes returned and whether the result came from the query
+# cache (no "sql" stage ran).
+#
+# Events go to a bounded in-memory log per server process, summarised in the
+# dashboard's debug panel and exportable as CSV, and to the "phonepe.perf"
+# logger at DEBUG level. stage() outside a span costs nothing.
+
+logger = logging.getLogger("phonepe.perf")
+
+EVENT_COLUMNS = ["time", "label", "stage", "seconds", "rows", "bytes", "cached"]
+
+_local = threading.local()
+
+
+class _Span:
+
+    def __init__(self, recorder, label: str):
+        self.recorder = recorder
+        self.label = label
+        self.stages = set()
+        self.rows = None
+        self.bytes = None
+
+    #Note the frame the span produced, for the rows / bytes columns
+    def result(self, df):
+        self.rows = len(df)
+        self.bytes = int(df.memory_usage(deep=True).sum())
+        return df
+
+
+class PerfRecorder:
+
+    def __init__(self, max_events: int = 10000):
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def record(self, label: str, stage: str, seconds: float, rows=None, nbytes=None, cached=None):
+        event = (time.time(), label, stage, seconds, rows, nbytes, cached)
+        with self._lock:
+            self._events.append(event)
+        logger.debug("%s %s %.2fms rows=%s bytes=%s cached=%s", label, stage,
+                     seconds * 1000, rows, nbytes, cached)
+
+    #Time a block as one labelled unit; stages run inside it (on this thread)
+    #are attributed to the label
+    @contextmanager
+    def span(self, label: str, total: str = "total"):
+        span = _Span(self, label)
+        outer = getattr(_local, "span", None)
+        _local.span = span
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            _local.span = outer
+            self.record(label, total, time.perf_counter() - started, span.rows, span.bytes,
+                        "sql" not in span.stages if span.rows is not None else None)
+
+    def events(self) -> pd.DataFrame:
+        with self._lock:
+            events = list(self._events)
+        df = pd.DataFrame(events, columns=EVENT_COLUMNS)
+        df["time"] = pd.to_datetime(df["time"], unit="s")
+        return df
+
+    #Per label and stage: calls, mean / max / total milliseconds, last rows and bytes
+    def summary(self) -> pd.DataFrame:
+        df = self.events()
+        if df.empty:
+            return pd.DataFrame(columns=["label", "stage", "calls", "mean_ms", "max_ms",
+                                         "total_ms", "rows", "bytes", "cache_hit_rate"])
+        df["ms"] = df["seconds"] * 1000
+        summary = df.groupby(["label", "stage"], sort=False).agg(
+            calls=("ms", "size"), mean_ms=("ms", "mean"), max_ms=("ms", "max"),
+            total_ms=("ms", "sum"), rows=("rows", "last"), bytes=("bytes", "last"),
+            cache_hit_rate=("cached", lambda s: s.dropna().astype(float).mean()))
+        return summary.reset_index().sort_values("total_ms", ascending=False, ignore_index=True)
+
+    def to_csv(self) -> bytes:
+        buffer = io.StringIO()
+        self.events().to_csv(buffer, index=False)
+        return buffer.getvalue().encode("utf-8")
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+
+#Time one stage of the current span, if there is one
+@contextmanager
+def stage(name: str):
+    span = getattr(_local, "span", None)
+    if span is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        span.stages.add(name)
+        span.recorder.record(span.label, name, time.perf_counter() - started)
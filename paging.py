@@ -0,0 +1,96 @@
+import math
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+from prepared import PreparedQuery
+
+#==================Paged, server-sorted result tables==================
+#
+# A query with a Paging spec is never fetched whole. The database sorts its
+# result and returns one page (ORDER BY ... LIMIT :page_limit OFFSET
+# :page_offset around the query's SQL), plus a COUNT(*) of the result for
+# the page count, which the query cache keeps until the data changes. Only
+# the visible rows are styled and sent to the browser.
+#
+# st.dataframe sorts on a header click in the browser only, within the rows
+# it holds, so the sort column and direction are picked in controls above
+# the table and applied on the server. Every sort column is its own prepared
+# statement; the page limit and offset are bound values.
+
+PAGE_SIZE = 25
+
+
+@dataclass(frozen=True)
+class Paging:
+    columns: tuple          #result columns offered for sorting
+    key: tuple              #columns that identify a row, the final tie-breaker
+    default_order: tuple    #((column, descending), ...) before the user picks a sort
+    page_size: int = PAGE_SIZE
+
+    #Sorted column first, then the default order, then the key, so a page
+    #boundary never depends on how the database breaks ties
+    def order_by(self, column: str = None, descending: bool = True) -> str:
+        if column is not None and column not in self.columns:
+            raise ValueError(f"Cannot sort by {column!r}, expected one of {self.columns}")
+        order = [(column, descending)] if column else []
+        order += [(c, d) for c, d in self.default_order if c != column]
+        order += [(c, False) for c in self.key if all(c != o for o, _ in order)]
+        return ", ".join(f"{c} {'DESC' if d else 'ASC'}" for c, d in order)
+
+    def count_query(self, base: PreparedQuery) -> PreparedQuery:
+        return PreparedQuery(f"{base.name}_count",
+                             f"SELECT COUNT(*) AS row_count FROM ({base.sql}) AS page_source",
+                             base.params)
+
+    #The statement for one page (1-based) and its values
+    def page_query(self, base: PreparedQuery, values: dict, column: str = None,
+                   descending: bool = True, page: int = 1) -> tuple:
+        suffix = f"{column}_{'desc' if descending else 'asc'}" if column else "default"
+        query = PreparedQuery(f"{base.name}_page_{suffix}",
+                              f"SELECT * FROM ({base.sql}) AS page_source "
+                              f"ORDER BY {self.order_by(column, descending)} "
+                              f"LIMIT :page_limit OFFSET :page_offset",
+                              base.params + (("page_limit", int), ("page_offset", int)))
+        return query, {**values, "page_limit": self.page_size,
+                       "page_offset": (page - 1) * self.page_size}
+
+    def pages(self, total_rows: int) -> int:
+        return max(1, math.ceil(total_rows / self.page_size))
+
+
+#Sort column, direction and page of a table from its controls' session state,
+#defaults before the first interaction; the page is clamped to the row count
+def page_state(key: str, paging: Paging, total_rows: int) -> tuple:
+    column = st.session_state.get(f"page_sort_{key}", paging.default_order[0][0])
+    descending = st.session_state.get(f"page_desc_{key}", paging.default_order[0][1])
+    page = min(st.session_state.get(f"page_{key}", 1), paging.pages(total_rows))
+    st.session_state[f"page_{key}"] = page
+    return column, descending, page
+
+
+def _first_page(key: str):
+    st.session_state[f"page_{key}"] = 1
+
+
+#Sort and page controls above a paged table
+def show_page_controls(key: str, paging: Paging, total_rows: int):
+    sort_col, order_col, page_col = st.columns([2, 1, 2])
+    with sort_col:
+        st.selectbox("Sort by", paging.columns, key=f"page_sort_{key}",
+                     index=paging.columns.index(paging.default_order[0][0]),
+                     on_change=_first_page, args=(key,))
+    with order_col:
+        st.toggle("Descending", key=f"page_desc_{key}", value=paging.default_order[0][1],
+                  on_change=_first_page, args=(key,))
+    with page_col:
+        pages = paging.pages(total_rows)
+        st.number_input(f"Page (of {pages}, {total_rows:,} rows)", min_value=1, max_value=pages,
+                        step=1, key=f"page_{key}")
+
+
+#Number a page's rows by their position in the whole sorted result
+def number_rows(df: pd.DataFrame, paging: Paging, page: int) -> pd.DataFrame:
+    start = (page - 1) * paging.page_size + 1
+    return df.set_axis(pd.RangeIndex(start, start + len(df)))
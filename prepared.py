@@ -0,0 +1,76 @@
+import hashlib
+import re
+from dataclasses import dataclass
+
+#==================Typed, parameterized queries==================
+#
+# Recurring dashboard queries are declared once as a PreparedQuery: SQL with
+# :name placeholders plus the Python type of every parameter. Values are
+# checked and coerced by bind(), so 2023 and "2023" give the same bound
+# parameters and the same result-cache key, and never reach the SQL text.
+#
+# The Postgres backend turns each query into a server-side prepared
+# statement once per pooled connection (PREPARE ... / EXECUTE ...), so a
+# period switch reuses the plan instead of parsing and planning new SQL
+# text. The statement name carries a hash of the SQL, so an edited query
+# never collides with an older prepared version.
+
+NAMED_PARAM = re.compile(r"(?<![:\w]):(\w+)")
+
+_PG_TYPES = {int: "bigint", float: "double precision", str: "text", bool: "boolean"}
+
+
+@dataclass(frozen=True)
+class PreparedQuery:
+    name: str
+    sql: str
+    params: tuple = ()      #((name, type), ...) in the order they are bound
+
+    @property
+    def statement(self) -> str:
+        digest = hashlib.sha1(self.sql.encode()).hexdigest()[:10]
+        return f"{self.name}_{digest}"
+
+    #Check a dict of values against the declared parameters and coerce them
+    def bind(self, values: dict = None) -> dict:
+        values = dict(values or {})
+        expected = dict(self.params)
+        missing = expected.keys() - values.keys()
+        extra = values.keys() - expected.keys()
+        if missing or extra:
+            raise TypeError(f"{self.name}: missing parameters {sorted(missing)}, "
+                            f"unexpected {sorted(extra)}")
+        bound = {}
+        for name, kind in self.params:
+            value = values[name]
+            if value is not None and not isinstance(value, kind):
+                try:
+                    value = kind(value)
+                except (TypeError, ValueError):
+                    raise TypeError(f"{self.name}: parameter {name} must be {kind.__name__}, "
+                                    f"got {value!r}") from None
+            bound[name] = value
+        return bound
+
+    #The SQL with :name placeholders turned into $1, $2, ... in parameter order
+    def positional_sql(self) -> str:
+        positions = {name: i for i, (name, _) in enumerate(self.params, 1)}
+        return NAMED_PARAM.sub(lambda m: f"${positions[m.group(1)]}", self.sql)
+
+    #Bound values in $n order, for positional_sql()
+    def positional_values(self, bound: dict) -> tuple:
+        return tuple(bound[name] for name, _ in self.params)
+
+    #PREPARE statement for Postgres
+    def prepare_sql(self) -> str:
+        body = self.positional_sql()
+        if not self.params:
+            return f"PREPARE {self.statement} AS {body}"
+        types = ", ".join(_PG_TYPES[kind] for _, kind in self.params)
+        return f"PREPARE {self.statement} ({types}) AS {body}"
+
+    #EXECUTE statement; the values are still sent as bound :name parameters
+    def execute_sql(self) -> str:
+        if not self.params:
+            return f"EXECUTE {self.statement}"
+        return f"EXECUTE {self.statement} ({', '.join(f':{name}' for name, _ in self.params)})"
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from pulse_schema import TABLES, arrow_schema
+
+#==================Single-pass Pulse JSON extractor==================
+#
+# Replaces the per-dataset loops of git_data.ipynb. The Pulse data tree is
+# walked once, the state-level files of all nine datasets are parsed in
+# parallel on a process pool, and rows come back as columnar batches
+# (dict of column -> list) already named like the table columns in
+# pulse_schema.py, with year and quarter as ints.
+#
+#   python pulse_extract.py C:\Python\Pulse\Data\data --out . --workers 8
+#   python pulse_extract.py C:\Python\Pulse\Data\data --out pulse_parquet --format parquet
+#
+# The Parquet output is one dataset per table, hive-partitioned by year and
+# quarter and typed by pulse_schema.arrow_schema(); it needs pyarrow.
+
+
+def _agg_transaction(data):
+    for item in data.get("transactionData") or []:
+        instrument = item["paymentInstruments"][0]
+        yield item["name"], instrument["count"], instrument["amount"]
+
+
+def _agg_users(data):
+    registered = (data.get("aggregated") or {}).get("registeredUsers", 0)
+    for device in data.get("usersByDevice") or []:
+        yield (registered, device.get("brand", "Unknown"), device.get("count", 0),
+               device.get("percentage", 0.0))
+
+
+def _map_transaction(data):
+    for item in data.get("hoverDataList") or []:
+        metric = item["metric"][0]
+        yield item["name"], metric["type"], metric["count"], metric["amount"]
+
+
+def _map_insurance(data):
+    for item in (data.get("data") or {}).get("data") or []:
+        yield item[0], item[1], item[2], item[3]
+
+
+def _map_users(data):
+    for district, values in (data.get("hoverData") or {}).items():
+        yield district, values.get("registeredUsers", 0), values.get("appOpens", 0)
+
+
+def _top_metric(data):
+    for level, key in (("District", "districts"), ("Pincode", "pincodes")):
+        for item in data.get(key) or []:
+            metric = item["metric"]
+            yield level, item["entityName"], metric["type"], metric["count"], metric["amount"]
+
+
+def _top_users(data):
+    for level, key in (("District", "districts"), ("Pincode", "pincodes")):
+        for item in data.get(key) or []:
+            yield level, item["name"], item["registeredUsers"]
+
+
+#table -> (directory under the Pulse data root, row parser for the "data" object)
+DATASETS = {
+    "agg_transaction": ("aggregated/transaction/country/india/state", _agg_transaction),
+    "agg_insurance": ("aggregated/insurance/country/india/state", _agg_transaction),
+    "agg_users": ("aggregated/user/country/india/state", _agg_users),
+    "top_transaction": ("top/transaction/country/india/state", _top_metric),
+    "top_insurance": ("top/insurance/country/india/state", _top_metric),
+    "top_users": ("top/user/country/india/state", _top_users),
+    "map_transaction": ("map/transaction/hover/country/india/state", _map_transaction),
+    "map_insurance": ("map/insurance/country/india/state", _map_insurance),
+    "map_users": ("map/user/hover/country/india/state", _map_users),
+}
+
+_PREFIXES = {tuple(path.split("/")): table for table, (path, _) in DATASETS.items()}
+
+
+def columns_of(table: str) -> list:
+    return [column for column, _ in TABLES[table]["columns"]]
+
+
+#Walk the tree once and list (table, path, state, year, quarter) for every
+#state-level quarter file of every dataset
+def find_files(root: str) -> list:
+    if os.path.isdir(os.path.join(root, "data")):
+        root = os.path.join(root, "data")
+
+    tasks = []
+    for dirpath, _, filenames in os.walk(root):
+        parts = tuple(os.path.relpath(dirpath, root).split(os.sep))
+        if len(parts) < 2:
+            continue
+        table = _PREFIXES.get(parts[:-2])
+        if table is None or not parts[-1].isdigit():
+            continue
+        state, year = parts[-2], int(parts[-1])
+        for filename in filenames:
+            stem, ext = os.path.splitext(filename)
+            if ext == ".json" and stem.isdigit():
+                tasks.append((table, os.path.join(dirpath, filename), state, year, int(stem)))
+    return tasks
+
+
+#Worker: parse a chunk of files into one columnar block per table
+def _parse_chunk(tasks) -> dict:
+    blocks = {}
+    for table, path, state, year, quarter in tasks:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f).get("data") or {}
+
+        block = blocks.get(table)
+        if block is None:
+            block = blocks[table] = {column: [] for column in columns_of(table)}
+        columns = list(block.values())
+        parser = DATASETS[table][1]
+        for row in parser(data):
+            columns[0].append(state)
+            columns[1].append(year)
+            columns[2].append(quarter)
+            for column, value in zip(columns[3:], row):
+                column.append(value)
+    return blocks
+
+
+class ExtractStats:
+
+    def __init__(self):
+        self.files = 0
+        self.rows = {table: 0 for table in DATASETS}
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+    def report(self) -> str:
+        lines = [f" {table:<18}{rows:>10} rows" for table, rows in self.rows.items()]
+        lines.append(f"\n {self.files} files in {self.seconds:.2f}s ({self.files_per_second:,.0f} files/s)")
+        return "\n".join(lines)
+
+
+def _merge(target: dict, block: dict):
+    for column, values in block.items():
+        target[column].extend(values)
+
+
+#Yield (table, {column: [values]}) batches of about batch_size rows for all
+#nine datasets from a single walk of the tree. Pass an ExtractStats to collect
+#throughput figures.
+def iter_batches(root: str, workers: int = None, batch_size: int = 100000,
+                 files_per_task: int = 200, stats: ExtractStats = None):
+    stats = stats or ExtractStats()
+    tasks = find_files(root)
+    chunks = [tasks[i:i + files_per_task] for i in range(0, len(tasks), files_per_task)]
+
+    pending = {table: {column: [] for column in columns_of(table)} for table in DATASETS}
+
+    def collect(blocks, n_files):
+        stats.files += n_files
+        for table, block in blocks.items():
+            n_rows = len(block["state"])
+            stats.rows[table] += n_rows
+            _merge(pending[table], block)
+            if len(pending[table]["state"]) >= batch_size:
+                batch = pending[table]
+                pending[table] = {column: [] for column in columns_of(table)}
+                yield table, batch
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from collect(_parse_chunk(chunk), len(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_parse_chunk, chunk): len(chunk) for chunk in chunks}
+            for future in as_completed(futures):
+                yield from collect(future.result(), futures[future])
+
+    for table, batch in pending.items():
+        if batch["state"]:
+            yield table, batch
+
+    stats.seconds = time.perf_counter() - stats.started
+
+
+#Write every dataset to <out>/<table>.csv, appending batch by batch
+def extract_to_csv(root: str, out_dir: str, **kwargs) -> ExtractStats:
+    os.makedirs(out_dir, exist_ok=True)
+    stats = ExtractStats()
+    written = set()
+    for table, batch in iter_batches(root, stats=stats, **kwargs):
+        path = os.path.join(out_dir, TABLES[table]["csv"])
+        pd.DataFrame(batch).to_csv(path, mode="a" if table in written else "w",
+                                   header=table not in written, index=False)
+        written.add(table)
+
+    #Header-only files for datasets without rows, so the loader still finds them
+    for table in DATASETS:
+        if table not in written:
+            pd.DataFrame(columns=columns_of(table)).to_csv(
+                os.path.join(out_dir, TABLES[table]["csv"]), index=False)
+    return stats
+
+
+#Write every dataset to <out>/<table>/year=YYYY/quarter=Q/*.parquet
+def extract_to_parquet(root: str, out_dir: str, **kwargs) -> ExtractStats:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    for table in DATASETS:
+        shutil.rmtree(os.path.join(out_dir, table), ignore_errors=True)
+
+    stats = ExtractStats()
+    for n, (table, batch) in enumerate(iter_batches(root, stats=stats, **kwargs)):
+        pq.write_to_dataset(pa.Table.from_pydict(batch, schema=arrow_schema(table)),
+                            os.path.join(out_dir, table), partition_cols=["year", "quarter"],
+                            basename_template=f"part-{n}-{{i}}.parquet")
+    return stats
+
+
+#Read a table's Parquet dataset, optionally only some columns and a filter
+#expression (e.g. pyarrow.dataset.field("year") == 2023) so only the matching
+#partitions are opened. Categoricals stay categorical in the DataFrame.
+def read_parquet_table(parquet_dir: str, table: str, columns: list = None, filter=None):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    schema = arrow_schema(table)
+    path = os.path.join(parquet_dir, table)
+    if not os.path.isdir(path):
+        return schema.empty_table().to_pandas()
+    partitioning = ds.partitioning(pa.schema([schema.field("year"), schema.field("quarter")]),
+                                   flavor="hive")
+    dataset = ds.dataset(path, format="parquet", schema=schema, partitioning=partitioning)
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the PhonePe Pulse JSON tree into one CSV per table")
+    parser.add_argument("root", help="Pulse repository or its data/ directory")
+    parser.add_argument("--out", default=".", help="directory for the CSV files (default: current)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                        help="one CSV per table, or a year/quarter partitioned Parquet dataset per table")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parser processes (default: one per core, 1 parses inline)")
+    parser.add_argument("--batch-size", type=int, default=100000,
+                        help="rows per batch held in memory per table (default %(default)s)")
+    args = parser.parse_args()
+
+    extract = extract_to_parquet if args.format == "parquet" else extract_to_csv
+    stats = extract(args.root, args.out, workers=args.workers, batch_size=args.batch_size)
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#==================Physical schema of the Pulse tables==================
+#
+# One entry per table loaded by data_insertion.py:
+#   csv          - file written by the extraction step
+#   rename       - CSV header -> column name
+#   read_csv     - extra pd.read_csv arguments
+#   columns      - (column, SQL type) in table order
+#   primary_key  - composite key, only where the Pulse JSON guarantees it
+#                  (dict keys / names unique within one state-quarter file)
+#   indexes      - secondary indexes for the dashboard's filters and sorts
+#
+# top_* tables carry pincode rows whose names can be missing, and map_insurance
+# holds raw lat/long points, so those get plain indexes instead of keys.
+
+TABLES = {
+    "agg_transaction": {
+        "csv": "agg_transaction.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "Transaction_type": "transaction_type",
+                   "Transaction_count": "transaction_count",
+                   "Transaction_amount": "transaction_amount"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("transaction_type", "TEXT"), ("transaction_count", "BIGINT"),
+                    ("transaction_amount", "DOUBLE PRECISION")],
+        "primary_key": ["state", "year", "quarter", "transaction_type"],
+        "indexes": ["year, quarter"],
+    },
+    "agg_insurance": {
+        "csv": "agg_insurance.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "name": "insurance_type", "Count": "insurance_count",
+                   "Amount": "insurance_amount"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("insurance_type", "TEXT"), ("insurance_count", "BIGINT"),
+                    ("insurance_amount", "DOUBLE PRECISION")],
+        "primary_key": ["state", "year", "quarter", "insurance_type"],
+        "indexes": ["year, quarter"],
+    },
+    "agg_users": {
+        "csv": "agg_users.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "registeredUsers": "registered_users", "Brand": "brand",
+                   "Count": "count", "Percentage": "percentage"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("registered_users", "INT"), ("brand", "TEXT"),
+                    ("count", "INT"), ("percentage", "DOUBLE PRECISION")],
+        "primary_key": ["state", "year", "quarter", "brand"],
+        "indexes": ["brand", "year, quarter"],
+    },
+    "top_transaction": {
+        "csv": "top_transaction.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "Level": "level", "EntityName": "entity_name", "Type": "type",
+                   "Count": "count", "Amount": "amount"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("level", "TEXT"), ("entity_name", "TEXT"), ("type", "TEXT"),
+                    ("count", "BIGINT"), ("amount", "DOUBLE PRECISION")],
+        "primary_key": None,
+        "indexes": ["state, year, quarter", "level, amount DESC", "level, count DESC"],
+    },
+    "top_insurance": {
+        "csv": "top_insurance.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "Level": "level", "EntityName": "entity_name", "Type": "type",
+                   "Count": "count", "Amount": "amount"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("level", "TEXT"), ("entity_name", "TEXT"), ("type", "TEXT"),
+                    ("count", "BIGINT"), ("amount", "DOUBLE PRECISION")],
+        "primary_key": None,
+        "indexes": ["state, year, quarter", "level, amount DESC"],
+    },
+    "top_users": {
+        "csv": "top_users.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "Level": "level", "Name": "district",
+                   "RegisteredUsers": "registered_users"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("level", "TEXT"), ("district", "TEXT"),
+                    ("registered_users", "BIGINT")],
+        "primary_key": None,
+        "indexes": ["state, year, quarter", "level, registered_users DESC"],
+    },
+    "map_transaction": {
+        "csv": "map_transaction.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "Districts": "districts", "Type": "type", "Count": "count",
+                   "Amount": "amount"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("districts", "TEXT"), ("type", "TEXT"), ("count", "BIGINT"),
+                    ("amount", "DOUBLE PRECISION")],
+        "primary_key": ["state", "year", "quarter", "districts", "type"],
+        "indexes": ["year, quarter"],
+    },
+    "map_insurance": {
+        "csv": "map_insurance.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "Latitude": "latitude", "Longitude": "longitude",
+                   "Metric": "metric", "Districts": "districts"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("latitude", "DOUBLE PRECISION"), ("longitude", "DOUBLE PRECISION"),
+                    ("metric", "DOUBLE PRECISION"), ("districts", "TEXT")],
+        "primary_key": None,
+        "indexes": ["state, year, quarter, districts"],
+    },
+    "map_users": {
+        "csv": "map_users.csv",
+        "rename": {"State": "state", "Year": "year", "Quarter": "quarter",
+                   "Districts": "districts", "RegisteredUsers": "registered_users",
+                   "appOpens": "app_opens"},
+        "columns": [("state", "TEXT"), ("year", "INT"), ("quarter", "INT"),
+                    ("districts", "TEXT"), ("registered_users", "BIGINT"),
+                    ("app_opens", "BIGINT")],
+        "primary_key": ["state", "year", "quarter", "districts"],
+        "indexes": ["year, quarter"],
+    },
+}
+
+
+#Explicit in-memory dtypes per SQL type, so loaders never infer types
+PANDAS_DTYPES = {"TEXT": object, "INT": "Int64", "BIGINT": "Int64",
+                 "DOUBLE PRECISION": "float64"}
+
+
+def pandas_dtypes(table: str) -> dict:
+    return {column: PANDAS_DTYPES[sql_type] for column, sql_type in TABLES[table]["columns"]}
+
+
+#Low-cardinality text columns, stored dictionary-encoded (categoricals) in Parquet
+CATEGORICAL_COLUMNS = {"state", "transaction_type", "insurance_type", "brand", "level", "type"}
+
+
+#Arrow schema for the Parquet copy of a table: categoricals for the repeated
+#labels, int32 year/quarter, int64 counts, float64 amounts
+def arrow_schema(table: str):
+    import pyarrow as pa
+
+    types = {"TEXT": pa.string(), "INT": pa.int32(), "BIGINT": pa.int64(),
+             "DOUBLE PRECISION": pa.float64()}
+    return pa.schema([
+        pa.field(column, pa.dictionary(pa.int32(), pa.string())
+                 if column in CATEGORICAL_COLUMNS else types[sql_type])
+        for column, sql_type in TABLES[table]["columns"]])
+
+
+def index_name(table: str, columns: str) -> str:
+    cols = columns.replace(" DESC", "_desc").replace(",", "").replace(" ", "_")
+    return f"idx_{table}_{cols}"
+
+
+#CREATE TABLE for a spec, optionally range-partitioned by year. `name` lets
+#the same spec be created under a staging name during reloads.
+def create_table_sql(table: str, partition_by_year: bool = False, name: str = None) -> str:
+    spec = TABLES[table]
+    name = name or table
+    lines = [f"{column} {sql_type}" for column, sql_type in spec["columns"]]
+    if spec["primary_key"]:
+        lines.append(f"PRIMARY KEY ({', '.join(spec['primary_key'])})")
+    sql = f"CREATE TABLE {name}(\n    " + ",\n    ".join(lines) + ")"
+    if partition_by_year:
+        sql += " PARTITION BY RANGE (year)"
+    return sql
+
+
+def create_partition_sql(name: str, year: int) -> str:
+    return (f"CREATE TABLE IF NOT EXISTS {name}_{year} PARTITION OF {name} "
+            f"FOR VALUES FROM ({year}) TO ({year + 1})")
+
+
+def create_index_sql(table: str, name: str = None) -> list:
+    name = name or table
+    return [f"CREATE INDEX {index_name(name, columns)} ON {name} ({columns})"
+            for columns in TABLES[table]["indexes"]]
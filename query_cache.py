@@ -0,0 +1,126 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+#==================Query result cache for the dashboard==================
+#
+# Results are keyed on the normalized SQL text plus its bound parameters and
+# held in a bounded LRU with a TTL. data_insertion.py bumps a version stamp in
+# the dataset_version table after every load; when the stamp changes the whole
+# cache is dropped, so a reload is picked up without waiting for the TTL.
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+#Collapse whitespace and trailing semicolons so formatting does not split keys
+def normalize_sql(sql: str) -> str:
+    return _WHITESPACE.sub(" ", sql).strip().rstrip(";").strip()
+
+
+def _freeze_params(params):
+    if not params:
+        return ()
+    return tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+
+class QueryCache:
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600,
+                 version_check_interval: float = 5):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_interval = version_check_interval
+
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self._version = None
+        self._version_checked_at = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions,
+                    "invalidations": self.invalidations,
+                    "dataset_version": self._version}
+
+    #Poll the dataset version at most once per interval and flush on change
+    def check_version(self, version_getter):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._version_checked_at < self.version_check_interval:
+                return
+            self._version_checked_at = now
+
+        version = version_getter()
+
+        with self._lock:
+            if version != self._version:
+                if self._version is not None or self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+
+    #Dataset version as of the latest poll, polling first if one is due
+    def current_version(self, version_getter):
+        self.check_version(version_getter)
+        with self._lock:
+            return self._version
+
+    #Return the cached result for (sql, params), running the query on a miss.
+    #Concurrent misses for the same key wait for the first caller instead of
+    #all hitting the database.
+    def get_or_run(self, sql: str, params, runner, version_getter=None):
+        if version_getter is not None:
+            self.check_version(version_getter)
+
+        key = (normalize_sql(sql), _freeze_params(params))
+
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    result, expires_at = entry
+                    if expires_at > time.monotonic():
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return result.copy()
+                    del self._entries[key]
+
+                event = self._inflight.get(key)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[key] = event
+                    self.misses += 1
+                    version = self._version
+                    break
+
+            event.wait()
+
+        try:
+            result = runner()
+            with self._lock:
+                #Skip storing a result that straddled a reload
+                if version == self._version:
+                    self._entries[key] = (result, time.monotonic() + self.ttl_seconds)
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            event.set()
+
+        return result.copy()
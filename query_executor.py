@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+#==================Concurrent query execution==================
+#
+# The queries of a use case are independent, so they are all submitted to a
+# thread pool at once and their results handed back in their original order:
+# query 1.3 is rendered as soon as 1.1-1.3 are done, while 1.4 onwards keep
+# running. A section then takes about as long as its slowest query instead of
+# the sum of all of them.
+#
+# One pool is shared by every session of the server process, so its size is
+# also the cap on concurrent dashboard queries; keep it within the database
+# pool (db.py pool_size + max_overflow).
+
+QUERY_WORKERS = 8
+
+
+def make_executor(workers: int = QUERY_WORKERS) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query")
+
+
+#Submit run(item) for every item and yield (item, result) in submission
+#order. A failed query raises when its turn comes. Queries not yet started
+#are cancelled if the caller stops early (e.g. Streamlit rerunning the page).
+def run_in_order(executor, run, items):
+    items = list(items)
+    futures = [executor.submit(run, item) for item in items]
+    try:
+        for item, future in zip(items, futures):
+            yield item, future.result()
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,138 @@
+import re
+
+from sqlalchemy import text
+
+from pulse_schema import index_name
+from table_swap import staging_name, swap_in
+
+#==================Summary / rollup tables==================
+#
+# The dashboard queries are GROUP BYs over a handful of grains. These tables
+# hold those grains precomputed, so a page query reads a few hundred rows
+# through an index instead of scanning the raw Pulse tables. data_insertion.py
+# calls refresh_rollups() at the end of every load; each rollup is rebuilt
+# under a staging name and swapped in, like the base tables. An incremental
+# load only rebuilds the rollups of the tables it changed.
+#
+# name -> (SELECT building the rollup, [index column lists])
+
+ROLLUPS = {
+    "rollup_transaction_state_quarter": ("""
+        SELECT state, year, quarter,
+               CAST(SUM(transaction_count) AS BIGINT) AS total_count,
+               SUM(transaction_amount) AS total_amount
+        FROM agg_transaction
+        GROUP BY state, year, quarter
+    """, ["year, quarter", "year DESC, quarter DESC, total_amount DESC", "state"]),
+
+    "rollup_transaction_type_quarter": ("""
+        SELECT transaction_type, year, quarter,
+               CAST(SUM(transaction_count) AS BIGINT) AS total_count,
+               SUM(transaction_amount) AS total_amount,
+               COUNT(*) AS row_count
+        FROM agg_transaction
+        GROUP BY transaction_type, year, quarter
+    """, ["year DESC, quarter DESC, total_amount DESC"]),
+
+    "rollup_map_transaction_district_year": ("""
+        SELECT state, districts, year, type,
+               CAST(SUM(count) AS BIGINT) AS total_count,
+               SUM(amount) AS total_amount
+        FROM map_transaction
+        GROUP BY state, districts, year, type
+    """, ["state, districts", "year"]),
+
+    "rollup_transaction_district_quarter": ("""
+        SELECT state, year, quarter, districts,
+               CAST(SUM(count) AS BIGINT) AS total_count,
+               SUM(amount) AS total_amount
+        FROM map_transaction
+        GROUP BY state, year, quarter, districts
+    """, ["state, year, quarter"]),
+
+    "rollup_insurance_district_point": ("""
+        SELECT state, districts,
+               COUNT(*) AS point_count,
+               AVG(latitude) AS latitude,
+               AVG(longitude) AS longitude
+        FROM map_insurance
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        GROUP BY state, districts
+    """, ["state"]),
+
+    "rollup_users_state_quarter": ("""
+        SELECT state, year, quarter,
+               CAST(SUM(registered_users) AS BIGINT) AS total_registered_users,
+               CAST(SUM(app_opens) AS BIGINT) AS total_app_opens
+        FROM map_users
+        GROUP BY state, year, quarter
+    """, ["year, quarter", "state"]),
+
+    "rollup_users_district": ("""
+        SELECT state, districts,
+               CAST(SUM(registered_users) AS BIGINT) AS total_registered_users,
+               CAST(SUM(app_opens) AS BIGINT) AS total_app_opens
+        FROM map_users
+        GROUP BY state, districts
+    """, ["total_registered_users DESC"]),
+
+    "rollup_brand_state_year": ("""
+        SELECT state, brand, year,
+               CAST(SUM(count) AS BIGINT) AS total_users
+        FROM agg_users
+        GROUP BY state, brand, year
+    """, ["brand", "year"]),
+
+    "rollup_insurance_state_quarter": ("""
+        SELECT state, year, quarter,
+               CAST(SUM(insurance_count) AS BIGINT) AS total_policies,
+               SUM(insurance_amount) AS total_premium
+        FROM agg_insurance
+        GROUP BY state, year, quarter
+    """, ["year, quarter", "state"]),
+
+    "rollup_top_transaction_entity": ("""
+        SELECT state, level, entity_name,
+               CAST(SUM(count) AS BIGINT) AS total_count,
+               SUM(amount) AS total_amount
+        FROM top_transaction
+        GROUP BY state, level, entity_name
+    """, ["level, total_amount DESC", "level, total_count DESC"]),
+
+    "rollup_top_insurance_entity": ("""
+        SELECT state, level, entity_name,
+               CAST(SUM(count) AS BIGINT) AS total_policies,
+               SUM(amount) AS total_premium
+        FROM top_insurance
+        GROUP BY state, level, entity_name
+    """, ["level, total_premium DESC"]),
+
+    "rollup_top_users_entity": ("""
+        SELECT state, level, district,
+               CAST(SUM(registered_users) AS BIGINT) AS total_users
+        FROM top_users
+        GROUP BY state, level, district
+    """, ["level, total_users DESC"]),
+}
+
+
+#The base table a rollup is built from
+def rollup_source(name: str) -> str:
+    return re.search(r"\bFROM\s+(\w+)", ROLLUPS[name][0]).group(1)
+
+
+#Rebuild the rollups of `tables` (all of them when None) from the base
+#tables, index them and swap them in
+def refresh_rollups(engine, tables=None):
+    for name, (select_sql, indexes) in ROLLUPS.items():
+        if tables is not None and rollup_source(name) not in tables:
+            continue
+        staging = staging_name(name)
+        with engine.connect() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+            conn.execute(text(f"CREATE TABLE {staging} AS {select_sql}"))
+            for columns in indexes:
+                conn.execute(text(f"CREATE INDEX {index_name(staging, columns)} ON {staging} ({columns})"))
+            conn.execute(text(f"ANALYZE {staging}"))
+            swap_in(conn, name)
+        print(f"\n Refreshed rollup {name}")
@@ -0,0 +1,57 @@
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+#==================Zero-downtime table swap==================
+#
+# Reloads build every table under a staging name, fill and index it there,
+# and only then swap it in. The swap drops the live table and renames the
+# staging table, its partitions and its indexes inside one short transaction,
+# so dashboard readers see either the old rows or the new ones, never an empty
+# or half-loaded table.
+
+SWAP_LOCK_TIMEOUT = "5s"
+SWAP_RETRIES = 3
+
+
+def staging_name(table: str) -> str:
+    return f"{table}_staging"
+
+
+#Tables, partitions and indexes created for the staging copy of a table
+def _staging_relations(conn, staging: str):
+    return conn.execute(text("""
+        SELECT c.relname, c.relkind
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema()
+          AND c.relkind IN ('r', 'p', 'i', 'I')
+          AND (starts_with(c.relname, :staging) OR starts_with(c.relname, 'idx_' || :staging))
+    """), {"staging": staging}).all()
+
+
+#Atomically replace `table` with its staging copy. The connection must be in
+#AUTOCOMMIT mode; the transaction is driven explicitly. lock_timeout keeps the
+#swap from queueing behind a long dashboard query, and the swap is retried.
+def swap_in(conn, table: str):
+    staging = staging_name(table)
+
+    statements = [f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'",
+                  f"DROP TABLE IF EXISTS {table}"]
+    for relname, relkind in _staging_relations(conn, staging):
+        kind = "INDEX" if relkind in ("i", "I") else "TABLE"
+        statements.append(f"ALTER {kind} {relname} RENAME TO {relname.replace(staging, table, 1)}")
+
+    for attempt in range(1, SWAP_RETRIES + 1):
+        conn.execute(text("BEGIN"))
+        try:
+            for sql in statements:
+                conn.execute(text(sql))
+            conn.execute(text("COMMIT"))
+            return
+        except OperationalError:
+            conn.execute(text("ROLLBACK"))
+            if attempt == SWAP_RETRIES:
+                raise
+            print(f"\n Swap of {table} waited too long for readers, retrying")
+            time.sleep(attempt)
@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+from charts import MAX_WIDTH, barh, png_width, render_png
+from use_cases import USE_CASES
+
+#Every use-case chart, drawn from a frame with long labels, must fit
+#Streamlit's content column so st.image sends the cached PNG unchanged
+
+
+def sample_frame(spec, rows: int = 10) -> pd.DataFrame:
+    df = pd.DataFrame({spec.values: [float(10**9 * (i + 1)) for i in range(rows)]})
+    if spec.labels == "year_quarter":
+        df["year"] = [2018 + i // 4 for i in range(rows)]
+        df["quarter"] = [i % 4 + 1 for i in range(rows)]
+    else:
+        df[spec.labels] = [f"dadra & nagar haveli & daman & diu district {i}" for i in range(rows)]
+    return df
+
+
+@pytest.mark.parametrize("query", [q for case in USE_CASES.values() for q in case.queries if q.chart],
+                         ids=lambda q: q.query_id)
+def test_use_case_chart_fits_content_width(query):
+    assert png_width(render_png(query.chart, sample_frame(query.chart))) <= MAX_WIDTH
+
+
+def test_very_long_labels_fit_content_width():
+    spec = barh("state", "total_amount", "Total Amount", "State")
+    df = pd.DataFrame({"state": ["x" * 300, "y"], "total_amount": [1.0, 2.0]})
+    assert png_width(render_png(spec, df)) <= MAX_WIDTH
@@ -0,0 +1,118 @@
+import os
+import uuid
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+import data_insertion
+from benchmarks.pulse_synth import generate_tree
+from data_insertion import apply_delta, frame_from_batch, partition_digests, read_table_csv, read_table_parquet
+from pulse_extract import extract_to_csv, extract_to_parquet, iter_batches
+from pulse_schema import TABLES, create_table_sql
+
+#Digests of the incremental loader, and apply_delta against a scratch schema.
+#The database tests use PHONEPE_TEST_DB_URL, else a throwaway server from
+#pgserver when it is installed, and are skipped otherwise.
+
+
+@pytest.fixture(scope="module")
+def pulse_tree(tmp_path_factory):
+    out = tmp_path_factory.mktemp("pulse")
+    tree = generate_tree(str(out), scale=0.2, states=["goa", "kerala"], years=[2022, 2023], workers=1)
+    extract_to_csv(tree["root"], str(out / "csv"), workers=1)
+    extract_to_parquet(tree["root"], str(out / "parquet"), workers=1)
+    return out, tree["root"]
+
+
+def json_digests(root: str) -> dict:
+    digests = {table: {} for table in TABLES}
+    for table, batch in iter_batches(root, workers=1):
+        digests[table].update(partition_digests(table, frame_from_batch(table, batch)))
+    return digests
+
+
+def test_csv_parquet_and_json_digests_match(pulse_tree, monkeypatch):
+    out, root = pulse_tree
+    from_json = json_digests(root)
+    monkeypatch.chdir(out / "csv")
+    for table in TABLES:
+        from_csv = partition_digests(table, read_table_csv(table))
+        from_parquet = partition_digests(table, read_table_parquet(table, str(out / "parquet")))
+        assert from_csv, table
+        assert from_csv == from_parquet == from_json[table], table
+
+
+def test_digests_ignore_row_order_and_see_changes(pulse_tree):
+    out, _ = pulse_tree
+    df = read_table_parquet("agg_transaction", str(out / "parquet"))
+    digests = partition_digests("agg_transaction", df)
+    assert partition_digests("agg_transaction", df.iloc[::-1]) == digests
+
+    changed = df.copy()
+    changed.loc[0, "transaction_count"] += 1
+    key = (changed.loc[0, "state"], int(changed.loc[0, "year"]), int(changed.loc[0, "quarter"]))
+    after = partition_digests("agg_transaction", changed)
+    assert [k for k in digests if digests[k] != after[k]] == [key]
+
+
+@pytest.fixture(scope="module")
+def db_url(tmp_path_factory):
+    url = os.environ.get("PHONEPE_TEST_DB_URL")
+    if url:
+        return url
+    pgserver = pytest.importorskip("pgserver")
+    server = pgserver.get_server(str(tmp_path_factory.mktemp("pgdata")), cleanup_mode="stop")
+    return server.get_uri().replace("postgresql://", "postgresql+psycopg2://")
+
+
+#A connection whose tables and load_manifest live in a schema of their own
+@pytest.fixture
+def conn(db_url, monkeypatch):
+    engine = create_engine(db_url, isolation_level="AUTOCOMMIT")
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    with engine.connect() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text(f"SET search_path TO {schema}"))
+        monkeypatch.setattr(data_insertion, "execute_query", lambda sql: conn.execute(text(sql)))
+        data_insertion.ensure_manifest()
+        yield conn
+        conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    engine.dispose()
+
+
+def sample_frame() -> pd.DataFrame:
+    return frame_from_batch("agg_transaction", {
+        "state": ["goa", "goa", "kerala", "kerala"],
+        "year": [2023, 2023, 2023, 2023],
+        "quarter": [1, 2, 1, 2],
+        "transaction_type": ["Merchant payments"] * 4,
+        "transaction_count": [10, 20, 30, 40],
+        "transaction_amount": [100.0, 200.0, 300.0, 400.0],
+    })
+
+
+def table_rows(conn) -> list:
+    return [tuple(row) for row in conn.execute(text(
+        "SELECT state, quarter, transaction_count FROM agg_transaction ORDER BY state, quarter"))]
+
+
+def test_apply_delta_replaces_only_changed_slices(conn):
+    conn.execute(text(create_table_sql("agg_transaction")))
+    df = sample_frame()
+    known = {}
+    assert apply_delta(conn, "agg_transaction", df, partition_digests("agg_transaction", df), known) == (4, 4)
+    assert table_rows(conn) == [("goa", 1, 10), ("goa", 2, 20), ("kerala", 1, 30), ("kerala", 2, 40)]
+
+    #Unchanged input: nothing written
+    assert apply_delta(conn, "agg_transaction", df, partition_digests("agg_transaction", df), known) == (0, 0)
+
+    #One changed slice, one slice missing from the input: only the changed one is replaced
+    df = df[df["state"] == "kerala"].copy()
+    df.loc[df["quarter"] == 2, "transaction_count"] = 41
+    assert apply_delta(conn, "agg_transaction", df, partition_digests("agg_transaction", df), known) == (1, 1)
+    assert table_rows(conn) == [("goa", 1, 10), ("goa", 2, 20), ("kerala", 1, 30), ("kerala", 2, 41)]
+
+    manifest = dict(((state, quarter), digest) for state, quarter, digest in conn.execute(text(
+        "SELECT state, quarter, digest FROM load_manifest WHERE table_name = 'agg_transaction'")))
+    assert manifest == {(state, quarter): digest for (state, _, quarter), digest in known.items()}
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from prepared import PreparedQuery
+
+#==================In-memory state x quarter transaction cube==================
+#
+# The Explore page only ever asks one question: totals per state for one
+# year-quarter. rollup_transaction_state_quarter (rollups.py), already at
+# that grain, is read once into two dense (period x state) NumPy matrices,
+# amount and count, with states stored as categorical codes. Changing the
+# period is then a row lookup of O(states) instead of a GROUP BY against the
+# database, and the map and the top-10 list are both served from that one row.
+
+CUBE_QUERY = PreparedQuery("transaction_cube", """
+SELECT state, year, quarter, total_count, total_amount
+FROM rollup_transaction_state_quarter
+""")
+
+
+class TransactionCube:
+
+    def __init__(self, states, periods, amount, count, has_rows):
+        self.states = states        #state names, indexed by code
+        self.periods = periods      #[(year, quarter)], newest first
+        self.amount = amount        #float64 [period, state]
+        self.count = count          #int64 [period, state]
+        self.has_rows = has_rows    #bool [period, state], state reported that quarter
+        self._period_index = {period: i for i, period in enumerate(periods)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "TransactionCube":
+        state = pd.Categorical(df["state"])
+        #year * 10 + quarter sorts like (year, quarter); negate so row 0 is the newest
+        key = df["year"].to_numpy(np.int64) * 10 + df["quarter"].to_numpy(np.int64)
+        keys, rows = np.unique(-key, return_inverse=True)
+        periods = [(int(-k // 10), int(-k % 10)) for k in keys]
+
+        shape = (len(periods), len(state.categories))
+        amount = np.zeros(shape, dtype=np.float64)
+        count = np.zeros(shape, dtype=np.int64)
+        has_rows = np.zeros(shape, dtype=bool)
+        amount[rows, state.codes] = df["total_amount"].fillna(0).to_numpy(np.float64)
+        count[rows, state.codes] = df["total_count"].fillna(0).to_numpy(np.int64)
+        has_rows[rows, state.codes] = True
+        return cls(np.asarray(state.categories, dtype=object), periods, amount, count, has_rows)
+
+    #state, total_amount, total_count for one year-quarter, largest amount first
+    def period_totals(self, year: int, quarter: int) -> pd.DataFrame:
+        i = self._period_index.get((year, quarter))
+        if i is None:
+            return pd.DataFrame({"state": pd.Series(dtype=object),
+                                 "total_amount": pd.Series(dtype=np.float64),
+                                 "total_count": pd.Series(dtype=np.int64)})
+        present = self.has_rows[i]
+        amount = self.amount[i, present]
+        order = np.argsort(-amount, kind="stable")
+        return pd.DataFrame({"state": self.states[present][order],
+                             "total_amount": amount[order],
+                             "total_count": self.count[i, present][order]})
@@ -0,0 +1,286 @@
+import streamlit as st
+from dataclasses import dataclass, field
+
+from charts import ChartSpec, bar, barh, line, show_chart
+from instrumentation import stage
+from paging import Paging
+from prepared import PreparedQuery
+
+#==================Business Use Case registry==================
+#
+# Every query of the "Business Use Cases" page is declared here once, with its
+# SQL, the number formats of its table and an optional chart spec (charts.py).
+# The dashboard only runs the SQL of the units the user selects, instead of
+# every query on every load. Filter values are bound parameters (params),
+# never part of the SQL text. Queries whose result grows with the data carry
+# a Paging spec and are fetched one sorted page at a time (paging.py).
+
+@dataclass
+class UseCaseQuery:
+    query_id: str
+    title: str
+    sql: str
+    params: dict = field(default_factory=dict)
+    formats: dict = field(default_factory=dict)
+    chart: ChartSpec = None
+    paging: Paging = None
+
+    #Server-side prepared form of the SQL, typed from the parameter values
+    @property
+    def prepared(self) -> PreparedQuery:
+        return PreparedQuery(f"use_case_{self.query_id.replace('.', '_')}", self.sql,
+                             tuple((name, type(value)) for name, value in self.params.items()))
+
+    #Result table, then the chart from the per-version PNG cache
+    def render(self, df, version=None):
+        with stage("style"):
+            st.dataframe(df.style.format(self.formats) if self.formats else df)
+        if self.chart:
+            with stage("chart"):
+                show_chart(self.query_id, version, self.chart, df)
+
+
+@dataclass
+class UseCase:
+    case_id: str
+    title: str
+    queries: list = field(default_factory=list)
+
+
+USE_CASES = {}
+
+
+def use_case(case_id: str, title: str):
+    USE_CASES[case_id] = UseCase(case_id, title)
+
+
+#Register a query of an existing use case
+def query(case_id: str, query_id: str, title: str, sql: str, params: dict = None,
+          formats: dict = None, chart: ChartSpec = None, paging: Paging = None):
+    USE_CASES[case_id].queries.append(UseCaseQuery(query_id, title, sql, params or {},
+                                                   formats or {}, chart, paging))
+
+
+def get_query(query_id: str) -> UseCaseQuery:
+    for case in USE_CASES.values():
+        for q in case.queries:
+            if q.query_id == query_id:
+                return q
+    raise KeyError(query_id)
+
+
+
+#==================Use Case 1==================
+
+use_case("1", "Decoding Transaction Dynamics on PhonePe")
+
+
+query("1", "1.1", "Top 10 states with the highest total transaction amount",
+      "SELECT state, SUM(total_amount) AS total_amount FROM rollup_transaction_state_quarter GROUP BY state ORDER BY total_amount DESC LIMIT 10",
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=barh('state', 'total_amount', 'Total Amount', 'State'))
+
+
+query("1", "1.2", "Total transaction count and Amount for each transaction type",
+      "SELECT transaction_type, SUM(total_count) AS total_count, SUM(total_amount) AS total_amount FROM rollup_transaction_type_quarter GROUP BY transaction_type ORDER BY total_amount DESC",
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=bar('transaction_type', 'total_amount', 'Transaction Type', 'Total Amount'))
+
+
+query("1", "1.3", "Which year had the highest total transactions across all states",
+      "SELECT year, SUM(total_count) AS total_count, SUM(total_amount) AS total_amount FROM rollup_transaction_state_quarter GROUP BY year ORDER BY total_amount DESC LIMIT 1",
+      formats={'total_amount': '₹{:,.0f}'})
+
+
+query("1", "1.4", "Top 5 districts with the most transaction volume",
+      "SELECT state, districts, SUM(total_amount) AS total_amount FROM rollup_map_transaction_district_year GROUP BY state, districts ORDER BY total_amount DESC LIMIT 5",
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=bar('districts', 'total_amount', 'District', 'Total Amount'))
+
+
+query("1", "1.5", "Total transactions happened in each quarter across all years",
+      "SELECT year, quarter, SUM(total_count) AS total_count FROM rollup_transaction_state_quarter GROUP BY year, quarter ORDER BY year, quarter",
+      chart=line('year_quarter', 'total_count', 'Quarter', 'Total Count', rotation=45))
+
+
+query("1", "1.6", "Quarterly transaction type analysis",
+      "SELECT transaction_type, year, quarter, total_amount, total_count AS total_transactions, CAST(total_amount / row_count AS NUMERIC(20,2)) AS avg_transaction_value FROM rollup_transaction_type_quarter ORDER BY year DESC, quarter DESC, total_amount DESC LIMIT 20",
+      formats={'total_amount': '₹{:,.0f}'})
+
+
+query("1", "1.7", "State-wise Pincode Transaction Summary",
+      "SELECT state, level, SUM(total_count) AS total_count, SUM(total_amount) AS total_amount FROM rollup_top_transaction_entity WHERE level = :level GROUP BY state, level ORDER BY total_amount DESC LIMIT 10",
+      params={"level": "Pincode"},
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=barh('state', 'total_amount', 'Total Amount', 'State'))
+
+
+query("1", "1.8", "Top Pincodes by Transaction Value",
+      "SELECT state, entity_name, total_count, total_amount FROM rollup_top_transaction_entity WHERE level = :level ORDER BY total_amount DESC LIMIT 5",
+      params={"level": "Pincode"},
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=bar('entity_name', 'total_amount', 'Pincode', 'Total Amount'))
+
+
+query("1", "1.9", "Top 10 Pincodes by Transaction Count",
+      "SELECT state, entity_name, total_count FROM rollup_top_transaction_entity WHERE level = :level ORDER BY total_count DESC LIMIT 10",
+      params={"level": "Pincode"},
+      chart=bar('entity_name', 'total_count', 'Pincode', 'Total Count'))
+
+
+query("1", "1.10", "Top 10 Districts by Transaction Count",
+      "SELECT state, districts, SUM(total_count) AS total_count FROM rollup_map_transaction_district_year GROUP BY state, districts ORDER BY total_count DESC LIMIT 10",
+      chart=bar('districts', 'total_count', 'District', 'Total Count'))
+
+
+query("1", "1.11", "Quarterly Transaction Summary",
+      "SELECT year, quarter, SUM(total_count) AS total_count, SUM(total_amount) AS total_amount FROM rollup_transaction_state_quarter GROUP BY year, quarter ORDER BY year, quarter",
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=line('year_quarter', 'total_amount', 'Quarter', 'Total Amount', rotation=45))
+
+
+#==================Use Case 2==================
+
+use_case("2", "Device Dominance and User Engagement Analysis")
+
+
+query("2", "2.1", "Top 10 mobile brands",
+      "SELECT brand, SUM(total_users) AS total_users FROM rollup_brand_state_year GROUP BY brand ORDER BY total_users DESC LIMIT 10",
+      chart=barh('brand', 'total_users', 'Total Users', 'Brand'))
+
+
+query("2", "2.2", "App engagement ratio",
+      "SELECT districts, SUM(total_registered_users) AS total_registered_users, SUM(total_app_opens) AS total_app_opens, ROUND(CAST(SUM(total_app_opens) AS NUMERIC) / NULLIF(SUM(total_registered_users), 0), 2) AS app_engagement_ratio FROM rollup_users_district GROUP BY districts ORDER BY app_engagement_ratio DESC LIMIT 20",
+      chart=bar('districts', 'app_engagement_ratio', 'District', 'Engagement Ratio', rotation=90))
+
+
+query("2", "2.3", "Top 10 Brands by State",
+      "SELECT state, brand, SUM(total_users) AS total_users FROM rollup_brand_state_year GROUP BY state, brand ORDER BY total_users DESC LIMIT 10",
+      chart=bar('brand', 'total_users', 'Brand', 'Total Users'))
+
+
+query("2", "2.4", "Yearly Registered Users by State",
+      "SELECT state, year, SUM(total_registered_users) AS total_users FROM rollup_users_state_quarter GROUP BY state, year ORDER BY year, total_users DESC LIMIT 20")
+
+
+query("2", "2.5", "Top 10 districts by registered users",
+      "SELECT state, districts, total_registered_users, total_app_opens FROM rollup_users_district ORDER BY total_registered_users DESC LIMIT 10",
+      chart=bar('districts', 'total_registered_users', 'District', 'Registered Users'))
+
+
+query("2", "2.6", "Brand Usage by Year",
+      "SELECT brand, year, SUM(total_users) AS total_users FROM rollup_brand_state_year GROUP BY brand, year ORDER BY year DESC, total_users DESC LIMIT 20")
+
+
+query("2", "2.7", "Quarter-wise app engagement",
+      "SELECT year, quarter, SUM(total_registered_users) AS total_registered_users, SUM(total_app_opens) AS total_app_opens, ROUND(CAST(SUM(total_app_opens) AS NUMERIC) / NULLIF(SUM(total_registered_users), 0), 2) AS avg_engagement_ratio FROM rollup_users_state_quarter GROUP BY year, quarter ORDER BY year, quarter",
+      chart=line('year_quarter', 'avg_engagement_ratio', 'Quarter', 'Engagement Ratio', rotation=45))
+
+
+#==================Use Case 3==================
+
+use_case("3", "Insurance Engagement Analysis")
+
+
+query("3", "3.1", "Top 10 States by Insurance Policies",
+      "SELECT state, SUM(total_policies) AS total_policies, SUM(total_premium) AS total_premium FROM rollup_insurance_state_quarter GROUP BY state ORDER BY total_policies DESC LIMIT 10",
+      formats={'total_premium': '₹{:,.0f}'},
+      chart=barh('state', 'total_policies', 'Total Policies', 'State'))
+
+
+query("3", "3.2", "Yearly Insurance Trends",
+      "SELECT year, SUM(total_policies) AS total_policies, SUM(total_premium) AS total_premium FROM rollup_insurance_state_quarter GROUP BY year ORDER BY year",
+      formats={'total_premium': '₹{:,.0f}'},
+      chart=line('year', 'total_policies', 'Year', 'Total Policies'))
+
+
+query("3", "3.3", "Quarterly Insurance Summary",
+      "SELECT year, quarter, SUM(total_policies) AS total_policies, SUM(total_premium) AS total_premium FROM rollup_insurance_state_quarter GROUP BY year, quarter ORDER BY year, quarter",
+      formats={'total_premium': '₹{:,.0f}'},
+      chart=line('year_quarter', 'total_policies', 'Quarter', 'Total Policies', rotation=45))
+
+
+query("3", "3.4", "Top 10 Insurance Districts",
+      "SELECT state, entity_name AS district, total_policies, total_premium FROM rollup_top_insurance_entity WHERE level = :level ORDER BY total_premium DESC LIMIT 10",
+      params={"level": "District"},
+      formats={'total_premium': '₹{:,.0f}'},
+      chart=bar('district', 'total_premium', 'District', 'Total Premium'))
+
+
+query("3", "3.5", "Insurance Count by State and Year",
+      "SELECT state, year, SUM(total_policies) AS total_policies FROM rollup_insurance_state_quarter GROUP BY state, year ORDER BY year DESC, total_policies DESC LIMIT 20")
+
+
+#==================Use Case 4==================
+
+use_case("4", "User Registration Analysis")
+
+
+query("4", "4.1", "Top 10 States by Registered Users",
+      "SELECT state, SUM(total_registered_users) AS total_registered_users FROM rollup_users_state_quarter GROUP BY state ORDER BY total_registered_users DESC LIMIT 10",
+      chart=barh('state', 'total_registered_users', 'Registered Users', 'State'))
+
+
+query("4", "4.2", "Top 10 Districts by Registered Users",
+      "SELECT state, district, total_users FROM rollup_top_users_entity WHERE level = :level ORDER BY total_users DESC LIMIT 10",
+      params={"level": "District"},
+      chart=bar('district', 'total_users', 'District', 'Total Users'))
+
+
+query("4", "4.3", "Top 10 Pincodes by Registered Users",
+      "SELECT state, district AS pincode, total_users FROM rollup_top_users_entity WHERE level = :level ORDER BY total_users DESC LIMIT 10",
+      params={"level": "Pincode"},
+      chart=bar('pincode', 'total_users', 'Pincode', 'Total Users'))
+
+
+query("4", "4.4", "Yearly User Registration Trends",
+      "SELECT year, SUM(total_registered_users) AS total_users FROM rollup_users_state_quarter GROUP BY year ORDER BY year",
+      chart=line('year', 'total_users', 'Year', 'Total Users'))
+
+
+query("4", "4.5", "Quarterly User Registration Summary",
+      "SELECT year, quarter, SUM(total_registered_users) AS total_users, SUM(total_app_opens) AS total_app_opens FROM rollup_users_state_quarter GROUP BY year, quarter ORDER BY year, quarter",
+      chart=line('year_quarter', 'total_users', 'Quarter', 'Total Users', rotation=45))
+
+
+#==================Use Case 5==================
+
+use_case("5", "Transaction Analysis Across States and Districts")
+
+
+query("5", "5.1", "Transaction Summary by State and Quarter",
+      "SELECT state, year, quarter, total_amount, total_count FROM rollup_transaction_state_quarter",
+      formats={'total_amount': '₹{:,.0f}'},
+      paging=Paging(columns=("state", "year", "quarter", "total_amount", "total_count"),
+                    key=("state", "year", "quarter"),
+                    default_order=(("year", True), ("quarter", True), ("total_amount", True))))
+
+
+query("5", "5.2", "Top 10 Districts by Transaction Amount",
+      "SELECT state, entity_name AS district, total_amount, total_count AS total_transactions FROM rollup_top_transaction_entity WHERE level = :level ORDER BY total_amount DESC LIMIT 10",
+      params={"level": "District"},
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=bar('district', 'total_amount', 'District', 'Total Amount'))
+
+
+query("5", "5.3", "Top 10 Pincodes by Transaction Amount",
+      "SELECT state, entity_name AS pincode, total_amount, total_count AS total_transactions FROM rollup_top_transaction_entity WHERE level = :level ORDER BY total_amount DESC LIMIT 10",
+      params={"level": "Pincode"},
+      formats={'total_amount': '₹{:,.0f}'},
+      chart=bar('pincode', 'total_amount', 'Pincode', 'Total Amount'))
+
+
+query("5", "5.4", "District Transaction by Type",
+      "SELECT state, districts, type, SUM(total_amount) AS total_amount, SUM(total_count) AS total_count FROM rollup_map_transaction_district_year GROUP BY state, districts, type",
+      formats={'total_amount': '₹{:,.0f}'},
+      paging=Paging(columns=("state", "districts", "type", "total_amount", "total_count"),
+                    key=("state", "districts", "type"),
+                    default_order=(("total_amount", True),)))
+
+
+query("5", "5.5", "District Transaction Summary by Year",
+      "SELECT state, districts, year, SUM(total_amount) AS total_amount, SUM(total_count) AS total_count FROM rollup_map_transaction_district_year GROUP BY state, districts, year",
+      formats={'total_amount': '₹{:,.0f}'},
+      paging=Paging(columns=("state", "districts", "year", "total_amount", "total_count"),
+                    key=("state", "districts", "year"),
+                    default_order=(("year", True), ("total_amount", True))))